@@ -1,20 +1,23 @@
-import requests
-from bs4 import BeautifulSoup
-import time
+import asyncio
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 
-def get_total_pages(session, base_url):
+MAX_CONCURRENCY = 16  # In-flight page fetches; keeps load on the server bounded
+
+async def get_total_pages(session, base_url):
     """
     Finds the total number of pages by finding the 'Last page' link.
     """
     try:
-        response = session.get(base_url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        async with session.get(base_url) as response:
+            response.raise_for_status()
+            body = await response.read()
+        tree = LexborHTMLParser(body)
         
-        last_page_tag = soup.find('a', {'data-hook': 'pagination__last'})
+        last_page_tag = tree.css_first('a[data-hook="pagination__last"]')
         
-        if last_page_tag and 'href' in last_page_tag.attrs:
-            last_page_url = last_page_tag['href']
+        if last_page_tag and last_page_tag.attributes.get('href'):
+            last_page_url = last_page_tag.attributes['href']
             # Extract the number from the end of the URL
             total_pages = int(last_page_url.split('/')[-1])
             return total_pages
@@ -22,7 +25,7 @@ def get_total_pages(session, base_url):
             # If there's no pagination link, there's only one page
             return 1
             
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Error connecting to {base_url}: {e}")
         return 1
     except (AttributeError, ValueError):
@@ -30,63 +33,70 @@ def get_total_pages(session, base_url):
         return 1
 
 
-def scrape_page(url, session):
+async def scrape_page(url, session, sem):
     """
     Scrapes the URLs for all posts on a single page.
     """
     urls_on_page = []
     try:
-        response = session.get(url)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        async with sem:
+            async with session.get(url) as response:
+                response.raise_for_status()
+                body = await response.read()
+        tree = LexborHTMLParser(body)
 
         # Find all the link tags directly
-        link_tags = soup.select('div.item-link-wrapper a.O16KGI')
+        link_tags = tree.css('div.item-link-wrapper a.O16KGI')
 
         for link_tag in link_tags:
-            if link_tag and 'href' in link_tag.attrs:
-                urls_on_page.append(link_tag['href'])
+            href = link_tag.attributes.get('href')
+            if href:
+                urls_on_page.append(href)
             
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Error fetching page {url}: {e}")
 
     return urls_on_page
 
 
-def main():
+async def main():
     """
     Main function to orchestrate the scraping process.
     """
     BASE_URL = "https://www.alifemoreorganised.co.uk/blog"
     all_post_urls = []
 
-    session = requests.Session()
-    session.headers.update({
+    headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    })
+    }
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=30)
 
-    print("Determining total number of pages...")
-    total_pages = get_total_pages(session, BASE_URL)
-    print(f"Found {total_pages} pages to scrape.")
+    async with aiohttp.ClientSession(connector=connector, headers=headers) as session:
+        print("Determining total number of pages...")
+        total_pages = await get_total_pages(session, BASE_URL)
+        print(f"Found {total_pages} pages to scrape.")
 
-    for page_num in range(1, total_pages + 1):
-        if page_num == 1:
-            current_url = BASE_URL
-        else:
-            current_url = f"{BASE_URL}/page/{page_num}"
+        page_list = []
+        for page_num in range(1, total_pages + 1):
+            if page_num == 1:
+                page_list.append(BASE_URL)
+            else:
+                page_list.append(f"{BASE_URL}/page/{page_num}")
+
+        # Fetch every page concurrently on one keep-alive connection pool
+        results = await asyncio.gather(*(scrape_page(url, session, sem) for url in page_list))
 
+    # Collect the results in page order
+    for page_num, (current_url, page_urls) in enumerate(zip(page_list, results), 1):
         print(f"\nScraping page {page_num} of {total_pages}: {current_url}")
         
-        page_urls = scrape_page(current_url, session)
-        
         if page_urls:
             all_post_urls.extend(page_urls)
             print(f"-> Found {len(page_urls)} URLs.")
         else:
             print("-> No URLs found on this page, stopping.")
             break
-        
-        time.sleep(1) # Be polite to the server
 
     if all_post_urls:
         # ---- MODIFIED SECTION: Save only URLs to a .txt file ----
@@ -111,4 +121,4 @@ def main():
         print("\n❌ Scraping finished, but no data was collected.")
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -1,4 +1,4 @@
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 import os
 
 # Define the input and output filenames
@@ -11,30 +11,27 @@ if not os.path.exists(input_html_file):
 else:
     try:
         # --- Step 1: Read the HTML file ---
-        with open(input_html_file, 'r', encoding='utf-8') as f:
+        # Read raw bytes; selectolax parses UTF-8 bytes directly, so decoding to a str first is wasted work
+        with open(input_html_file, 'rb') as f:
             html_content = f.read()
 
-        # --- Step 2: Parse the HTML with Beautiful Soup ---
-        soup = BeautifulSoup(html_content, 'html.parser')
+        # --- Step 2: Parse the HTML with selectolax ---
+        tree = LexborHTMLParser(html_content)
 
-        # --- Step 3: Find all article containers ---
-        # The provided HTML uses <article> tags with the class 'fusion-post-grid'
-        articles = soup.find_all('article', class_='fusion-post-grid')
-        
-        extracted_links = []
-        for article in articles:
-            # Find the <h2> tag with the class 'entry-title' which holds the main link
-            title_element = article.find('h2', class_='entry-title')
-            if title_element:
-                link_element = title_element.find('a')
-                # Check if the <a> tag exists and has an 'href' attribute
-                if link_element and 'href' in link_element.attrs:
-                    extracted_links.append(link_element['href'])
+        # --- Step 3: Find all article title links ---
+        # The provided HTML uses <article> tags with the class 'fusion-post-grid',
+        # and the <h2 class="entry-title"> inside each one holds the main link.
+        # The selector itself skips <a> tags with a missing or empty 'href' attribute
+        extracted_links = [
+            link_element.attributes['href']
+            for link_element in tree.css('article.fusion-post-grid h2.entry-title a[href]:not([href=""])')
+        ]
 
         # --- Step 4: Write the extracted links to a file ---
+        # One newline-joined string, written in a single call
         with open(output_txt_file, 'w', encoding='utf-8') as f:
-            for link in extracted_links:
-                f.write(link + '\n') # Write each link on a new line
+            if extracted_links:
+                f.write('\n'.join(extracted_links) + '\n')
         
         print(f"✅ Success! Scraped {len(extracted_links)} links and saved them to '{output_txt_file}'")
 
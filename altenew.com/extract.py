@@ -1,30 +1,110 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
 from urllib.parse import urljoin, urlparse, parse_qs
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
 import time
 
-def get_last_page_number(url):
+MAX_WORKERS = 8 # Concurrent page fetches; keeps load on the server bounded
+
+# Pooled session, retrying transient errors
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    # Honour Retry-After on 429s
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=['GET', 'HEAD'],
+    ),
+))
+
+REQUEST_INTERVAL = 1.0  # Seconds between request starts to the host, across all workers
+_next_start = 0.0
+_next_start_lock = threading.Lock()
+
+def wait_turn():
+    """Sleeps until this thread's slot to start a request comes up."""
+    global _next_start
+    with _next_start_lock:
+        now = time.monotonic()
+        start = max(now, _next_start)
+        # Claim the slot before sleeping so concurrent callers queue up behind it
+        _next_start = start + REQUEST_INTERVAL
+    if start > now:
+        time.sleep(start - now)
+
+def stream_links(chunks):
+    """
+    Feeds body chunks to lxml as they arrive and yields each finished <a> element,
+    so parsing overlaps the network read and the full tree is never built.
+    """
+    parser = etree.HTMLPullParser(events=('end',), tag='a')
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from (el for _, el in parser.read_events())
+    parser.close()
+    yield from (el for _, el in parser.read_events())
+
+def extract_page_links(chunks, base_url, pagination_hrefs=None):
+    """
+    Extracts the article links from a page's HTML, given as an iterable of byte chunks.
+    If pagination_hrefs is a list, the hrefs of the links inside div.pagination are
+    appended to it in document order during the same pass.
+    """
+    page_links = set()
+    base_origin = 'https://' + urlparse(base_url).netloc
+    for el in stream_links(chunks):
+        if pagination_hrefs is not None and any(
+            'pagination' in (div.get('class') or '').split() for div in el.iterancestors('div')
+        ):
+            pagination_hrefs.append(el.get('href'))
+        elif 'article__title' in (el.get('class') or '').split():
+            href = el.get('href')
+            if href:
+                # Only fall back to urljoin's full parse for hrefs that aren't absolute or root-relative
+                if href.startswith(('http://', 'https://')):
+                    full_url = href
+                elif href.startswith('/') and not href.startswith('//'):
+                    full_url = base_origin + href
+                else:
+                    full_url = urljoin(base_url, href)
+                page_links.add(full_url)
+        # Drop processed elements so memory stays bounded regardless of page size
+        el.clear()
+        while el.getprevious() is not None:
+            del el.getparent()[0]
+    return page_links
+
+def get_last_page_number(url, base_url):
     """
     Fetches the first page to determine the total number of pages from the pagination controls.
-    
+    The first page's article links are returned too, so it never has to be fetched twice;
+    links and pagination both come out of a single streaming parse.
     """
+    first_page_links = set()
+    pagination_hrefs = []
     try:
         print("Finding the total number of pages...")
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        soup = BeautifulSoup(response.text, 'html.parser')
+        wait_turn()
+        with session.get(url, timeout=10, stream=True) as response:
+            response.raise_for_status()  # Raise an exception for bad status codes
+            first_page_links = extract_page_links(response.iter_content(65536), base_url, pagination_hrefs)
         
-        pagination = soup.find('div', class_='pagination')
-        if not pagination:
+        if not pagination_hrefs:
             print("Pagination not found. Assuming a single page.")
-            return 1
+            return 1, first_page_links
         
-        page_links = pagination.find_all('a')
-        if not page_links or len(page_links) < 2:
-            return 1
+        if len(pagination_hrefs) < 2:
+            return 1, first_page_links
 
         # The link to the last page is the one before the "Next" arrow's link
-        last_page_href = page_links[-2].get('href')
+        last_page_href = pagination_hrefs[-2]
         
         # Parse the URL to extract the 'page' number
         parsed_url = urlparse(last_page_href)
@@ -33,46 +113,56 @@ def get_last_page_number(url):
         if 'page' in query_params:
             last_page = int(query_params['page'][0])
             print(f"Found {last_page} pages to scrape.")
-            return last_page
+            return last_page, first_page_links
         else:
-            return 1
+            return 1, first_page_links
             
     except requests.exceptions.RequestException as e:
         print(f"Error fetching the website to find total pages: {e}")
-        return None
+        return None, set()
     except (AttributeError, IndexError, ValueError):
         print("Could not parse the last page number. Scraping might be incomplete.")
-        return 1
+        return 1, first_page_links
 
-def scrape_all_blog_links(base_url, total_pages):
+def scrape_page_links(base_url, page_num, total_pages):
     """
-    Loops through each page of the blog, scraping all unique article links.
+    Scrapes the article links from a single page of the blog.
     """
-    all_article_links = set()
+    page_links = set()
+    page_url = f"{base_url}?page={page_num}&view=24"
+    print(f"Scraping page {page_num}/{total_pages}...")
     
-    if not total_pages:
-        return all_article_links
-        
-    for page_num in range(1, total_pages + 1):
-        page_url = f"{base_url}?page={page_num}&view=24"
-        print(f"Scraping page {page_num}/{total_pages}...")
-        
-        try:
-            response = requests.get(page_url, timeout=10)
+    try:
+        wait_turn()
+        with session.get(page_url, timeout=10, stream=True) as response:
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            for link_tag in soup.find_all('a', class_='article__title'):
-                href = link_tag.get('href')
-                if href:
-                    full_url = urljoin(base_url, href)
-                    all_article_links.add(full_url)
-            
-            time.sleep(1) # Be polite to the server
+            page_links = extract_page_links(response.iter_content(65536), base_url)
+
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to fetch page {page_num}. Skipping. Error: {e}")
+        
+    return page_links
 
-        except requests.exceptions.RequestException as e:
-            print(f"Failed to fetch page {page_num}. Skipping. Error: {e}")
-            continue
+def scrape_all_blog_links(base_url, total_pages, first_page_links):
+    """
+    Scrapes every remaining page of the blog concurrently, collecting all unique article links.
+    """
+    all_article_links = set(first_page_links)
+    
+    if not total_pages:
+        return all_article_links
+    
+    # Page 1 is already parsed; the rest go out as one batch
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        future_to_page = {
+            executor.submit(scrape_page_links, base_url, page_num, total_pages): page_num
+            for page_num in range(2, total_pages + 1)
+        }
+        for future in as_completed(future_to_page):
+            try:
+                all_article_links.update(future.result())
+            except Exception as e:
+                print(f"Page {future_to_page[future]} failed: {e}")
             
     return all_article_links
 
@@ -81,19 +171,19 @@ if __name__ == "__main__":
     start_url = "https://altenew.com/blogs/paper-crafting-inspiration-and-tips"
     output_filename = "links.txt"
     
-    # 1. Get the total number of pages
-    num_pages = get_last_page_number(f"{start_url}?view=24")
+    # 1. Get the total number of pages (and the first page's links along the way)
+    num_pages, first_page_links = get_last_page_number(f"{start_url}?view=24", start_url)
     
-    # 2. Scrape the links from all pages
-    links = scrape_all_blog_links(start_url, num_pages)
+    # 2. Scrape the links from the remaining pages
+    links = scrape_all_blog_links(start_url, num_pages, first_page_links)
     
     # 3. Write the results to the output file
     if links:
         print(f"\nWriting {len(links)} unique links to {output_filename}...")
+        data = ('\n'.join(sorted(links)) + '\n').encode('utf-8')
         # Use 'with open' to automatically handle closing the file
-        with open(output_filename, 'w', encoding='utf-8') as f:
-            for link in sorted(list(links)):
-                f.write(link + '\n') # Write each link on a new line
+        with open(output_filename, 'wb') as f:
+            f.write(data)
         
         print(f"✅ Successfully saved links to {output_filename}")
     else:
@@ -1,13 +1,71 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.etree
+import lxml.html
+from lxml.cssselect import CSSSelector
+import threading
 import time
-from urllib.parse import urljoin
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin, urlparse
+
+MAX_WORKERS = 4  # Categories scraped at the same time
+REQUEST_TIMEOUT = 10  # Seconds before a stalled connection or read is given up on
 
 # Define headers to mimic a web browser
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 }
 
+# Shared session with retries on transient errors
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=["GET", "HEAD"],
+    ),
+))
+session.headers.update(HEADERS)
+
+# Selectors compiled to XPath once
+H2_A = CSSSelector("h2.entry-title a")
+NEXT = CSSSelector(".pagination-next a")
+
+
+REQUEST_INTERVAL = 1.0  # Minimum seconds between request starts to the site
+_next_start = 0.0
+_next_start_lock = threading.Lock()
+
+
+def wait_turn():
+    """Blocks until the next request slot, which all threads share."""
+    global _next_start
+    with _next_start_lock:
+        now = time.monotonic()
+        start = max(now, _next_start)
+        _next_start = start + REQUEST_INTERVAL
+    if start > now:
+        time.sleep(start - now)
+
+
+def fetch_tree(url, timeout=REQUEST_TIMEOUT):
+    """Streams a page into lxml; returns the root, or None for an empty body."""
+    wait_turn()
+    with session.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        parser = lxml.html.HTMLParser()
+        try:
+            for chunk in response.iter_content(65536):
+                parser.feed(chunk)
+            return parser.close()
+        except lxml.etree.XMLSyntaxError:
+            return None
+
 
 def scrape_category_links(base_url):
     """
@@ -17,21 +75,24 @@ def scrape_category_links(base_url):
         base_url (str): The starting URL for the category.
 
     Returns:
-        list: A list of all unique recipe URLs found in the category.
+        set: A set of all unique recipe URLs found in the category.
     """
+    print(f"\n{'='*20}\nScraping Category: {base_url}\n{'='*20}")
     current_url = base_url
     page_number = 1
-    category_links = []
+    category_links = set()
+    base_origin = "https://" + urlparse(base_url).netloc
 
     while current_url:
         print(f"Scraping page {page_number} from category: {base_url}")
         try:
-            response = requests.get(current_url, headers=HEADERS)
-            response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
+            tree = fetch_tree(current_url)
+            if tree is None:
+                print(f" -> Empty response from {current_url}, stopping this category.")
+                break
 
             # Find all <a> tags inside <h2> tags with the class "entry-title"
-            article_links = soup.select("h2.entry-title a")
+            article_links = H2_A(tree)
 
             if not article_links and page_number == 1:
                 print(" -> No article links found in this category.")
@@ -40,15 +101,19 @@ def scrape_category_links(base_url):
             for link in article_links:
                 href = link.get("href")
                 if href:
-                    full_url = urljoin(base_url, href)
-                    category_links.append(full_url)
+                    if href.startswith(("http://", "https://")):
+                        full_url = href
+                    elif href.startswith("/") and not href.startswith("//"):
+                        full_url = base_origin + href
+                    else:
+                        full_url = urljoin(base_url, href)
+                    category_links.add(full_url)
 
             # Find the "Next Page" link
-            next_page_link = soup.select_one(".pagination-next a")
-            if next_page_link and next_page_link.get("href"):
-                current_url = next_page_link.get("href")
+            next_page_links = NEXT(tree)
+            if next_page_links and next_page_links[0].get("href"):
+                current_url = next_page_links[0].get("href")
                 page_number += 1
-                time.sleep(1)  # Be polite to the server
             else:
                 current_url = None  # No more pages
 
@@ -60,12 +125,12 @@ def scrape_category_links(base_url):
 
 
 def save_links_to_txt(links, filename="recipe_links.txt"):
-    """Saves a list of links to a text file, one link per line."""
-    # Use a set to automatically remove duplicate links
-    unique_links = sorted(list(set(links)))
-    with open(filename, "w", encoding="utf-8") as f:
-        for link in unique_links:
-            f.write(link + "\n")
+    """Saves a set of links to a text file, one link per line, sorted."""
+    # Links are already deduplicated as they are collected
+    unique_links = sorted(links)
+    data = ("\n".join(unique_links) + "\n").encode("utf-8") if unique_links else b""
+    with open(filename, "wb") as f:
+        f.write(data)
     print(f"\nSuccessfully saved {len(unique_links)} unique links to {filename}")
 
 
@@ -81,13 +146,11 @@ if __name__ == "__main__":
         "https://www.amummytoo.co.uk/category/halloween/",
     ]
 
-    all_recipe_links = []
-    for url in category_urls:
-        print(f"\n{'='*20}\nScraping Category: {url}\n{'='*20}")
-        links_from_category = scrape_category_links(url)
-        if links_from_category:
-            all_recipe_links.extend(links_from_category)
-        time.sleep(2)  # Pause between categories
+    all_recipe_links = set()
+    # Categories run concurrently; each one pages sequentially
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for links_from_category in executor.map(scrape_category_links, category_urls):
+            all_recipe_links |= links_from_category
 
     if all_recipe_links:
         save_links_to_txt(all_recipe_links)
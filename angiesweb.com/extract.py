@@ -1,7 +1,55 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.etree
+import lxml.html
+from lxml.cssselect import CSSSelector
 import time
 
+HEADERS = {"User-Agent": "My-Web-Scraper-Bot/1.0"}
+REQUEST_TIMEOUT = 10  # Seconds
+
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=["GET", "HEAD"],
+    ),
+))
+session.headers.update(HEADERS)
+
+
+REQUEST_DELAY = 1.0  # Minimum seconds between the starts of consecutive page requests
+_last_start = 0.0
+
+
+def wait_turn():
+    """Sleeps off what is left of REQUEST_DELAY since the previous request started."""
+    global _last_start
+    delay = REQUEST_DELAY - (time.monotonic() - _last_start)
+    if delay > 0:
+        time.sleep(delay)
+    _last_start = time.monotonic()
+
+
+def fetch_tree(url, timeout=REQUEST_TIMEOUT):
+    """GETs url and parses the body as it streams in; None if nothing parsable came back."""
+    wait_turn()
+    with session.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        parser = lxml.html.HTMLParser()
+        try:
+            for chunk in response.iter_content(65536):
+                parser.feed(chunk)
+            return parser.close()
+        except lxml.etree.XMLSyntaxError:
+            return None
+
 
 def scrape_all_pages(start_url, article_selector, next_page_selector):
     """
@@ -13,13 +61,15 @@ def scrape_all_pages(start_url, article_selector, next_page_selector):
         next_page_selector (str): The CSS selector for the 'Older Posts' or 'Next Page' link.
 
     Returns:
-        list: A list of all unique article URLs found.
+        set: A set of all unique article URLs found.
     """
     all_article_links = set()
     current_url = start_url
     page_num = 0
 
-    headers = {"User-Agent": "My-Web-Scraper-Bot/1.0"}
+    # Translate the selectors to XPath once rather than on every page
+    article_sel = CSSSelector(article_selector)
+    next_page_sel = CSSSelector(next_page_selector)
 
     # This loop continues as long as a 'current_url' exists.
     # It will stop when it can't find a 'next_page_selector' on the last page.
@@ -28,36 +78,36 @@ def scrape_all_pages(start_url, article_selector, next_page_selector):
         print(f"--- Scraping Page {page_num}: {current_url} ---")
 
         try:
-            response = requests.get(current_url, headers=headers)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.text, "html.parser")
+            tree = fetch_tree(current_url)
+            if tree is None:
+                print(f"Empty response from {current_url}, stopping.")
+                break
 
             # Find all article links using the provided selector
-            article_elements = soup.select(article_selector)
+            article_elements = article_sel(tree)
 
             page_links = {
-                link.get("href") for link in article_elements if link.get("href")
+                link.get("href")
+                for link in article_elements
+                if link.get("href")
             }
             print(f"Found {len(page_links)} new articles on this page.")
             all_article_links.update(page_links)
 
             # Find the link to the next page using the provided selector
-            next_link_element = soup.select_one(next_page_selector)
+            next_link_elements = next_page_sel(tree)
 
-            if next_link_element:
-                current_url = next_link_element.get("href")
+            if next_link_elements:
+                current_url = next_link_elements[0].get("href")
             else:
                 print("\nNo more pages found. Reached the end.")
                 current_url = None  # This will stop the while loop
 
-            time.sleep(1)  # Be polite!
-
         except requests.exceptions.RequestException as e:
             print(f"An error occurred: {e}")
             break
 
-    return list(all_article_links)
+    return all_article_links
 
 
 # --- Main execution block ---
@@ -87,9 +137,11 @@ if __name__ == "__main__":
 
     file_name = "links.txt"
     try:
-        with open(file_name, "w", encoding="utf-8") as f:
-            for link in sorted(scraped_links):  # Sorting the links for a clean output
-                f.write(f"{link}\n")
+        # Sort for a clean output, then join and encode once for a single write
+        sorted_links = sorted(scraped_links)
+        data = ("\n".join(sorted_links) + "\n").encode("utf-8") if sorted_links else b""
+        with open(file_name, "wb") as f:
+            f.write(data)
 
         print(f"Successfully saved {len(scraped_links)} links to {file_name}")
 
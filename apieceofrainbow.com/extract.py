@@ -1,6 +1,63 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import lxml.etree
+import lxml.html
+from lxml.cssselect import CSSSelector
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+MAX_WORKERS = 4  # Concurrent category crawls
+REQUEST_TIMEOUT = 10  # Connect/read timeout in seconds
+
+# One session for all categories, retrying 429s and 5xx
+session = requests.Session()
+session.mount("https://", HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=["GET", "HEAD"],
+    ),
+))
+
+CATEGORY_SEL = CSSSelector("ul#menu-main-menu li.menu-item-object-category a")
+ARTICLE_SEL = CSSSelector('article.entry-card h6.entry-title a[href]:not([href=""])')
+NEXT_SEL = CSSSelector("a.next.page-numbers")
+
+
+REQUEST_INTERVAL = 1.0
+_next_start = 0.0
+_next_start_lock = threading.Lock()
+
+
+def wait_turn():
+    """Waits for this request's turn under REQUEST_INTERVAL."""
+    global _next_start
+    with _next_start_lock:
+        now = time.monotonic()
+        start = max(now, _next_start)
+        _next_start = start + REQUEST_INTERVAL
+    if start > now:
+        time.sleep(start - now)
+
+
+def fetch_tree(url, timeout=REQUEST_TIMEOUT):
+    """Fetches and parses a page incrementally. Returns None for an empty body."""
+    wait_turn()
+    with session.get(url, stream=True, timeout=timeout) as response:
+        response.raise_for_status()
+        parser = lxml.html.HTMLParser()
+        try:
+            for chunk in response.iter_content(65536):
+                parser.feed(chunk)
+            return parser.close()
+        except lxml.etree.XMLSyntaxError:
+            return None
 
 
 def get_category_links(main_url):
@@ -9,18 +66,14 @@ def get_category_links(main_url):
     """
     links = set()
     try:
-        response = requests.get(main_url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
+        tree = fetch_tree(main_url)
 
         # The main navigation menu has the id 'menu-main-menu'
         # We find all links within list items that are of object type 'category'
-        nav_menu = soup.find("ul", id="menu-main-menu")
-        if nav_menu:
-            for item in nav_menu.find_all("li", class_="menu-item-object-category"):
-                link = item.find("a")
-                if link and link.has_attr("href") and "/category/" in link["href"]:
-                    links.add(link["href"])
+        for link in CATEGORY_SEL(tree) if tree is not None else ():
+            href = link.get("href")
+            if href and "/category/" in href:
+                links.add(href)
 
         if not links:
             print(
@@ -42,23 +95,51 @@ def get_category_links(main_url):
 
 def get_links_from_page(url):
     """
-    Scrapes all blog post links from a given category page.
+    Scrapes all blog post links from a given category page, along with the
+    URL of the next page (None on the last page), from a single fetch.
     """
     links = set()
+    next_url = None
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, "html.parser")
-
-        for article in soup.find_all("article", class_="entry-card"):
-            title = article.find("h6", class_="entry-title")
-            if title:
-                link = title.find("a")
-                if link and link.has_attr("href"):
-                    links.add(link["href"])
+        tree = fetch_tree(url)
+        if tree is None:
+            print(f"Empty response from {url}")
+            return links, next_url
+
+        # The selector already filters out anchors with a missing or empty href
+        links = {link.get("href") for link in ARTICLE_SEL(tree)}
+
+        next_page_tags = NEXT_SEL(tree)
+        if next_page_tags:
+            next_url = next_page_tags[0].get("href") or None
     except requests.exceptions.RequestException as e:
         print(f"Error fetching {url}: {e}")
-    return links
+    return links, next_url
+
+
+def scrape_category_links(url):
+    """
+    Scrapes all blog post links from a single start URL, following pagination.
+    """
+    category_links = set()
+    current_url = url
+    page_num = 1
+    while current_url:
+        print(f"Scraping: {current_url}")
+        # One fetch per page gives both the article links and the next-page link
+        links_on_page, next_url = get_links_from_page(current_url)
+        if not links_on_page:
+            print(
+                f"No links found on page {page_num} of {url}. Moving to next URL."
+            )
+            break
+
+        category_links.update(links_on_page)
+
+        current_url = next_url
+        if current_url:
+            page_num += 1
+    return category_links
 
 
 def scrape_all_links(start_urls):
@@ -66,38 +147,9 @@ def scrape_all_links(start_urls):
     Scrapes all blog post links from the given start URLs, following pagination.
     """
     all_links = set()
-    for url in start_urls:
-        current_url = url
-        page_num = 1
-        while current_url:
-            print(f"Scraping: {current_url}")
-            links_on_page = get_links_from_page(current_url)
-            if not links_on_page:
-                print(
-                    f"No links found on page {page_num} of {url}. Moving to next URL."
-                )
-                break
-
-            all_links.update(links_on_page)
-
-            try:
-                response = requests.get(current_url, timeout=10)
-                response.raise_for_status()
-                soup = BeautifulSoup(response.content, "html.parser")
-
-                next_page_tag = soup.find("a", class_="next page-numbers")
-
-                if next_page_tag and next_page_tag.has_attr("href"):
-                    current_url = next_page_tag["href"]
-                    page_num += 1
-                    time.sleep(1)
-                else:
-                    current_url = None
-            except requests.exceptions.RequestException as e:
-                print(
-                    f"Error occurred while trying to find next page from {current_url}: {e}"
-                )
-                current_url = None
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for category_links in executor.map(scrape_category_links, start_urls):
+            all_links.update(category_links)
     return all_links
 
 
@@ -111,9 +163,10 @@ if __name__ == "__main__":
         print(f"Found {len(category_urls)} categories to scrape.")
         scraped_links = scrape_all_links(category_urls)
 
-        with open("links.txt", "w") as f:
-            for link in sorted(list(scraped_links)):
-                f.write(link + "\n")
+        sorted_links = sorted(scraped_links)
+        data = ("\n".join(sorted_links) + "\n").encode("utf-8") if sorted_links else b""
+        with open("links.txt", "wb") as f:
+            f.write(data)
 
         print(f"\nFinished scraping. Found {len(scraped_links)} unique links.")
         print("All links have been saved to links.txt")
@@ -1,5 +1,9 @@
-import requests
-from bs4 import BeautifulSoup
+import asyncio
+import aiohttp
+import aiofiles
+from urllib.parse import urlparse
+from lxml import etree
+import io
 import time
 import os # <-- Added for file handling
 
@@ -26,57 +30,110 @@ else:
 # --- END MODIFICATION ---
 
 # --- MODIFICATION: Load last state ---
-start_category = None
-start_page = 1
+# Categories are scraped concurrently, so the state file holds one
+# "category,next_page" line per category (next_page 0 = category finished)
+category_state = {}
 if os.path.exists(STATE_FILE):
     try:
         with open(STATE_FILE, 'r', encoding='utf-8') as f:
-            state_data = f.read().strip()
-            if state_data:
-                start_category, page_str = state_data.split(',')
-                start_page = int(page_str)
-                print(f"Resuming from category '{start_category}', page {start_page}")
+            for line in f:
+                line = line.strip()
+                if line:
+                    category, page_str = line.rsplit(',', 1)
+                    category_state[category] = int(page_str)
+        if category_state:
+            print(f"Resuming from saved state for {len(category_state)} categories")
     except Exception as e:
         print(f"Warning: Could not read state file ({e}). Starting from beginning.")
-        start_category = None
-        start_page = 1
+        category_state = {}
 # --- END MODIFICATION ---
 
-
-# Use a session for connection pooling
-session = requests.Session()
-session.headers.update({
+HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-})
+}
+MAX_CONCURRENCY = 10 # Requests in flight at once
+MIN_HOST_INTERVAL = 1.5 # Minimum seconds between request starts to the same host
+MAX_429_RETRIES = 5 # Times to back off on 429 Too Many Requests before giving up on a page
 
-# --- MODIFICATION: Find starting category ---
-found_start_category = (start_category is None)
+state_lock = asyncio.Lock()
+host_lock = asyncio.Lock()
+last_fetch = {} # host -> time.monotonic() of the last request start
+
+
+async def save_state(category, page):
+    """Records the next page to fetch for a category and rewrites the state file."""
+    category_state[category] = page
+    async with state_lock:
+        data = ''.join(f"{c},{p}\n" for c, p in category_state.items())
+        tmp_file = STATE_FILE + '.tmp'
+        try:
+            async with aiofiles.open(tmp_file, 'w', encoding='utf-8') as f:
+                await f.write(data)
+            # Swap the new state in atomically so a crash never leaves a torn file
+            os.replace(tmp_file, STATE_FILE)
+        except IOError as e:
+            print(f"Warning: Could not save state to {STATE_FILE}. {e}")
+
+
+async def wait_for_host(host):
+    """Spaces out request starts to the same host by at least MIN_HOST_INTERVAL."""
+    async with host_lock:
+        now = time.monotonic()
+        delay = MIN_HOST_INTERVAL - (now - last_fetch.get(host, 0))
+        last_fetch[host] = now + max(0, delay)
+    if delay > 0:
+        await asyncio.sleep(delay)
 
-for category in CATEGORIES:
-    # This block skips categories until we find the one we left off on
-    if not found_start_category:
-        if category == start_category:
-            found_start_category = True # Start processing from this category
-        else:
-            print(f"\n--- Skipping Category: {category} (already processed) ---")
-            continue
-    # --- END MODIFICATION ---
+
+async def fetch(session, sem, url):
+    """Fetches a page body, bounded by the semaphore and the per-host delay."""
+    for attempt in range(MAX_429_RETRIES + 1):
+        async with sem:
+            await wait_for_host(urlparse(url).netloc)
+            async with session.get(url) as response:
+                # A 429 is temporary, so back off rather than abandoning the category
+                if response.status != 429 or attempt == MAX_429_RETRIES:
+                    # Raise an error for bad responses (4xx or 5xx)
+                    response.raise_for_status()
+                    return await response.read()
+                retry_after = response.headers.get('Retry-After', '')
+                delay = int(retry_after) if retry_after.isdigit() else 30
+
+        # Sleep outside the semaphore so other categories keep their slots meanwhile
+        print(f"Got 429 for {url}. Retrying in {delay}s...")
+        await asyncio.sleep(delay)
+
+
+def is_grid_headline(el):
+    """True if the link sits in a SummaryItemWrapper inside a main content grid."""
+    in_item = False
+    for ancestor in el.iterancestors('div'):
+        classes = (ancestor.get('class') or '').split()
+        if 'SummaryItemWrapper-ircKXK' in classes:
+            in_item = True
+        elif in_item and 'grid-layout__content' in classes:
+            return True
+    return False
+
+
+async def scrape_category(session, sem, category, out_f):
+    """Walks one category's pages in order, appending new links to out_f."""
+    page = category_state.get(category, 1) # Start from page 1 or the resumed page
+    if page == 0:
+        print(f"\n--- Skipping Category: {category or 'Homepage'} (already processed) ---")
+        return
 
     # Handle the empty string category (homepage)
     if category == '':
         print(f"\n--- Scraping Category: Homepage ---")
     else:
         print(f"\n--- Scraping Category: {category} ---")
-        
-    page = start_page # Start from page 1 or the resumed page
-    
+
     while True:
         # --- MODIFICATION: Save current state *before* fetching ---
-        try:
-            with open(STATE_FILE, 'w', encoding='utf-8') as f:
-                f.write(f"{category},{page}")
-        except IOError as e:
-            print(f"Warning: Could not save state to {STATE_FILE}. {e}")
+        # Flush first so every link from earlier pages is on disk before the state moves past them
+        await out_f.flush()
+        await save_state(category, page)
         # --- END MODIFICATION ---
 
         # Construct the correct URL based on the page number
@@ -84,68 +141,56 @@ for category in CATEGORIES:
             current_url = f"{BASE_URL}/{category}"
         else:
             current_url = f"{BASE_URL}/{category}?page={page}"
-            
+
         print(f"Fetching page {page}: {current_url}")
-        
+
         try:
-            response = session.get(current_url)
-            # Raise an error for bad responses (4xx or 5xx)
-            response.raise_for_status() 
-        except requests.exceptions.RequestException as e:
+            content = await fetch(session, sem, current_url)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"Error fetching URL {current_url}: {e}")
-            break # Stop scraping this category if a page fails
-
-        soup = BeautifulSoup(response.text, 'html.parser')
-        
-        # 1. Find ALL main content grids, not just the first one.
-        content_blocks = soup.find_all('div', class_='grid-layout__content')
-        
-        # This will hold all articles from ALL content blocks
-        all_article_containers = []
-        
-        if not content_blocks:
-            print(f"No 'grid-layout__content' blocks found. Assuming no articles.")
-        else:
-            # 2. Loop through each content block found
-            for content_block in content_blocks:
-                # Find all article items *within this specific block*
-                articles_in_block = content_block.find_all('div', class_='SummaryItemWrapper-ircKXK')
-                # Add them to our master list
-                all_article_containers.extend(articles_in_block)
-        
-        if not all_article_containers:
+            return # Stop scraping this category if a page fails
+
+        headline_found = False
+        new_links = []
+
+        # Stream the page's <a> elements and keep the headline link of every article item
+        # in ALL main content grids, without building the full tree
+        for _, el in etree.iterparse(io.BytesIO(content), html=True, tag='a'):
+            if 'summary-item__hed-link' in (el.get('class') or '').split() and is_grid_headline(el):
+                headline_found = True
+                href = el.get('href')
+
+                if href:
+                    # Build the full URL
+                    if href.startswith('http'):
+                        full_url = href
+                    else:
+                        # Handle relative URLs like '/story/...'
+                        full_url = BASE_URL + href
+
+                    # Keep only links we haven't saved yet
+                    if full_url not in saved_links:
+                        saved_links.add(full_url)
+                        new_links.append(full_url)
+
+            # Drop processed elements so memory stays bounded regardless of page size
+            el.clear()
+            while el.getprevious() is not None:
+                del el.getparent()[0]
+
+        if not headline_found:
             print(f"No more articles found for '{category}'. Moving to next category.")
             break # Exit the while loop for this category
 
-        links_found_on_page = 0
-        
+        links_found_on_page = len(new_links)
+
         try:
-            # Open the file in 'append' mode to write links as we find them
-            # We no longer need the initial 'w' write, as we load existing links
-            with open(OUTPUT_FILE, 'a', encoding='utf-8') as f:
-                # Loop through the combined list of all articles
-                for item in all_article_containers:
-                    # Find the specific headline link you pointed out
-                    link_tag = item.find('a', class_='summary-item__hed-link')
-                    
-                    if link_tag and link_tag.get('href'):
-                        href = link_tag['href']
-                        
-                        # Build the full URL
-                        if href.startswith('http'):
-                            full_url = href
-                        else:
-                            # Handle relative URLs like '/story/...'
-                            full_url = BASE_URL + href
-                        
-                        # Write to file only if it's a new link
-                        if full_url not in saved_links:
-                            f.write(full_url + '\n')
-                            saved_links.add(full_url)
-                            links_found_on_page += 1
+            # Append the page's new links as one joined write to the shared output handle
+            if new_links:
+                await out_f.write('\n'.join(new_links) + '\n')
 
             print(f"Found and saved {links_found_on_page} new links from page {page}.")
-            
+
             # If a page returns 0 *new* links, we can assume we're done
             if links_found_on_page == 0 and page > 1:
                 print("No new links found on this page. Ending category.")
@@ -153,23 +198,36 @@ for category in CATEGORIES:
 
         except IOError as e:
             print(f"Error writing to file: {e}")
-            break # Stop if we can't write to the file
-            
+            return # Stop if we can't write to the file
+
         page += 1
-        time.sleep(1) # Be polite to the server, wait 1 second between requests
-    
-    # --- MODIFICATION: Reset start_page for the *next* category ---
-    start_page = 1
+
+    # Mark the category as finished so a resumed run skips it
+    await out_f.flush()
+    await save_state(category, 0)
+
+
+async def main():
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=MAX_CONCURRENCY, limit_per_host=3)
+    # One long-lived, buffered append handle for the whole run instead of reopening it per page
+    async with aiohttp.ClientSession(connector=connector, headers=HEADERS) as session, \
+            aiofiles.open(OUTPUT_FILE, 'a', encoding='utf-8', buffering=1 << 20) as out_f:
+        # Each category pages sequentially; the categories themselves run concurrently
+        await asyncio.gather(*(scrape_category(session, sem, category, out_f) for category in CATEGORIES))
+
+    # --- MODIFICATION: Clean up state file on completion ---
+    print(f"\n--- Scraping Complete ---")
+    if os.path.exists(STATE_FILE):
+        try:
+            os.remove(STATE_FILE)
+            print(f"Successfully removed state file {STATE_FILE}.")
+        except OSError as e:
+            print(f"Error: Could not remove state file {STATE_FILE}. {e}")
     # --- END MODIFICATION ---
 
-# --- MODIFICATION: Clean up state file on completion ---
-print(f"\n--- Scraping Complete ---")
-if os.path.exists(STATE_FILE):
-    try:
-        os.remove(STATE_FILE)
-        print(f"Successfully removed state file {STATE_FILE}.")
-    except OSError as e:
-        print(f"Error: Could not remove state file {STATE_FILE}. {e}")
-# --- END MODIFICATION ---
+    print(f"Total unique links saved to {OUTPUT_FILE}: {len(saved_links)}")
+
 
-print(f"Total unique links saved to {OUTPUT_FILE}: {len(saved_links)}")
\ No newline at end of file
+if __name__ == '__main__':
+    asyncio.run(main())
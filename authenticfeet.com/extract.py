@@ -1,8 +1,54 @@
 # scraper.py
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from lxml import etree
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+MAX_WORKERS = 4
+
+session = requests.Session()
+session.mount('https://', HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        respect_retry_after_header=True,
+        allowed_methods=['GET', 'HEAD'],
+    ),
+))
+session.headers.update({'User-Agent': 'Mozilla/5.0'})
+
+REQUEST_INTERVAL = 1.0  # Seconds, across all workers
+_next_start = 0.0
+_next_start_lock = threading.Lock()
+
+def wait_turn():
+    """Paces request starts across the worker threads."""
+    global _next_start
+    with _next_start_lock:
+        now = time.monotonic()
+        start = max(now, _next_start)
+        _next_start = start + REQUEST_INTERVAL
+    if start > now:
+        time.sleep(start - now)
+
+def stream_links(chunks):
+    """
+    Feeds body chunks to lxml as they arrive and yields each finished <a> element,
+    so parsing overlaps the network read and the full tree is never built.
+    """
+    parser = etree.HTMLPullParser(events=('end',), tag='a')
+    for chunk in chunks:
+        parser.feed(chunk)
+        yield from (el for _, el in parser.read_events())
+    parser.close()
+    yield from (el for _, el in parser.read_events())
 
 def scrape_category(base_url, all_links_set):
     """
@@ -23,41 +69,41 @@ def scrape_category(base_url, all_links_set):
             
         print(f"Scraping page {page_number} of '{base_url}'...")
         
+        found_articles = False
         try:
-            # Send a request to the URL
-            response = requests.get(current_url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=15)
-            
-            # If we get a 404 error, it means the page doesn't exist, so we're done.
-            if response.status_code == 404:
-                print(f"Page {page_number} not found. Reached the end of this category.\n")
-                break
-            
-            # Raise an error for other bad status codes (e.g., 500, 403)
-            response.raise_for_status()
-            
+            wait_turn()
+            with session.get(current_url, timeout=15, stream=True) as response:
+                # If we get a 404 error, it means the page doesn't exist, so we're done.
+                if response.status_code == 404:
+                    print(f"Page {page_number} not found. Reached the end of this category.\n")
+                    break
+
+                # Raise an error for other bad status codes (e.g., 500, 403)
+                response.raise_for_status()
+
+                # Pick out the 'a' tag within every h3 with the specified classes
+                for el in stream_links(response.iter_content(65536)):
+                    parent = el.getparent()
+                    if parent is not None and parent.tag == 'h3' and \
+                            {'entry-title', 'td-module-title'} <= set((parent.get('class') or '').split()):
+                        found_articles = True
+                        href = el.get('href')
+                        if href:
+                            all_links_set.add(href)
+                    # Free finished elements as we go
+                    el.clear()
+                    while el.getprevious() is not None:
+                        del el.getparent()[0]
         except requests.exceptions.RequestException as e:
             print(f"An error occurred while fetching {current_url}: {e}\n")
             break
 
-        # Parse the HTML content of the page
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Find all h3 tags with the specified class
-        article_headers = soup.find_all('h3', class_='entry-title td-module-title')
-        
         # If no articles are found on a page (after the first one), we assume we've reached the end.
-        if not article_headers and page_number > 1:
+        if not found_articles and page_number > 1:
             print("No more articles found. Reached the end of this category.\n")
             break
-            
-        # Extract the href from the 'a' tag within each h3
-        for header in article_headers:
-            link_tag = header.find('a')
-            if link_tag and 'href' in link_tag.attrs:
-                all_links_set.add(link_tag['href'])
 
         page_number += 1
-        time.sleep(1) # Be polite to the server by waiting a second between requests
 
 
 def main():
@@ -74,17 +120,24 @@ def main():
     all_article_links = set()
     output_filename = "bakefromscratch_links.txt"
     
-    # Scrape each category
-    for url in category_urls:
-        scrape_category(url, all_article_links)
+    # Scrape the categories concurrently; set.add is atomic, so they can share the set
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        future_to_url = {
+            executor.submit(scrape_category, url, all_article_links): url
+            for url in category_urls
+        }
+        for future in as_completed(future_to_url):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"Category {future_to_url[future]} failed: {e}")
         
     print(f"Scraping complete. Found {len(all_article_links)} unique article links.")
     
-    # Save the collected links to a text file
+    # Save the collected links to a text file, sorted
     with open(output_filename, 'w', encoding='utf-8') as f:
-        # Sort the links alphabetically for a clean output
-        for link in sorted(list(all_article_links)):
-            f.write(link + '\n')
+        if all_article_links:
+            f.write('\n'.join(sorted(all_article_links)) + '\n')
             
     print(f"All links have been successfully saved to '{output_filename}'")
 
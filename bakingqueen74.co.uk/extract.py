@@ -1,15 +1,19 @@
 # scraper_bakingqueen74_final.py
 
-import requests
-from bs4 import BeautifulSoup
-import time
+import asyncio
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
+from pybloom_live import ScalableBloomFilter
 
-def get_category_links(index_url):
+MAX_CATEGORY_WORKERS = 4  # Categories paginating at the same time
+
+async def get_category_links(session, index_url):
     """
     Scrapes the main recipe index for lists with the class 'feast-category-index-list'
     to get all category URLs.
 
     Args:
+        session (aiohttp.ClientSession): The shared HTTP session.
         index_url (str): The URL of the main recipe index page.
 
     Returns:
@@ -18,41 +22,38 @@ def get_category_links(index_url):
     print(f"Fetching category links from: {index_url}")
     category_links = set() 
     try:
-        response = requests.get(index_url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=15)
-        response.raise_for_status()
+        async with session.get(index_url) as response:
+            response.raise_for_status()
+            content = await response.read()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        tree = LexborHTMLParser(content)
         
         # --- CORRECTION START ---
-        # Find all <ul> lists that have the specific class for CATEGORIES.
+        # Only <ul> lists with the specific class for CATEGORIES count.
         # This will correctly ignore the recipe lists (fsri-list).
-        category_lists = soup.find_all('ul', class_='feast-category-index-list')
-        
-        if not category_lists:
+        if tree.css_first('ul.feast-category-index-list') is None:
             print("Could not find any <ul class='feast-category-index-list'> containers.")
             return []
 
-        # Iterate through each category list found
-        for ulist in category_lists:
-            # Find all 'a' tags within that list
-            links = ulist.find_all('a')
-            for link in links:
-                if 'href' in link.attrs:
-                    category_links.add(link['href'])
+        # Collect the 'a' tags from every category list in a single query
+        for link in tree.css('ul.feast-category-index-list a[href]'):
+            category_links.add(link.attributes['href'])
         # --- CORRECTION END ---
         
         print(f"Found {len(category_links)} unique category links to scrape.\n")
         return list(category_links)
 
-    except requests.exceptions.RequestException as e:
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         print(f"Error fetching the index page {index_url}: {e}")
         return []
 
-def scrape_recipes_in_category(category_url, file_handler, tracked_links_set):
+async def scrape_recipes_in_category(session, category_url, file_handler, tracked_links_set):
     """
     Scrapes all recipe links from a category, handling pagination and writing immediately.
+    Returns the number of links written for this category.
     """
     page_number = 1
+    written_count = 0
     
     while True:
         if page_number == 1:
@@ -64,41 +65,50 @@ def scrape_recipes_in_category(category_url, file_handler, tracked_links_set):
         print(f"Scraping page {page_number} of '{category_url}'...")
         
         try:
-            response = requests.get(current_url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=15)
-            
-            if response.status_code == 404:
-                print(f"  -> Page {page_number} not found. Finished this category.\n")
-                break
-            
-            response.raise_for_status()
-
-        except requests.exceptions.RequestException as e:
+            async with session.get(current_url) as response:
+                # Dispatch on the status code so 4xx/5xx pages end the category without
+                # raising and catching an exception
+                status = response.status
+                if status == 404:
+                    print(f"  -> Page {page_number} not found. Finished this category.\n")
+                    break
+                if status >= 400:
+                    print(f"  -> HTTP {status} on {current_url}, stopping.\n")
+                    break
+
+                content = await response.read()
+
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"  -> An error occurred while fetching {current_url}: {e}\n")
             break
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        tree = LexborHTMLParser(content)
         
         # This selector for the recipe list is still correct for the category pages.
-        recipe_list = soup.find('ul', class_='fsri-list')
+        recipe_list = tree.css_first('ul.fsri-list')
         
-        if not recipe_list:
+        if recipe_list is None:
             print(f"  -> No recipe list found on page {page_number}. Ending this category.\n")
             break
 
-        recipe_links = recipe_list.find_all('a')
+        recipe_links = recipe_list.css('a')
         
         if not recipe_links and page_number > 1:
             print("  -> No more recipe links found. Finished this category.\n")
             break
 
-        new_links_found = 0
-        for link_tag in recipe_links:
-            if 'href' in link_tag.attrs:
-                link = link_tag['href']
-                if link not in tracked_links_set:
-                    file_handler.write(link + '\n')
-                    tracked_links_set.add(link)
-                    new_links_found += 1
+        page_links = [link_tag.attributes.get('href') for link_tag in recipe_links]
+
+        # Keep page order, drop missing hrefs, repeats within the page and links already written, then
+        # write them in one call. No await happens in between, so categories running
+        # concurrently can't interleave here
+        new_links = [link for link in dict.fromkeys(page_links)
+                     if link is not None and link not in tracked_links_set]
+        file_handler.writelines(link + '\n' for link in new_links)
+        for link in new_links:
+            tracked_links_set.add(link)
+        new_links_found = len(new_links)
+        written_count += new_links_found
         
         if new_links_found > 0:
             print(f"  -> Found and wrote {new_links_found} new recipe link(s).")
@@ -106,33 +116,53 @@ def scrape_recipes_in_category(category_url, file_handler, tracked_links_set):
             print("  -> No new links found on this page.")
 
         page_number += 1
-        time.sleep(1)
+        await asyncio.sleep(1) # Doesn't block the other categories
 
-def main():
+    return written_count
+
+async def main():
     """
     Main function to run the scraper.
     """
     start_url = "https://bakingqueen74.co.uk/recipe-index-3/"
     output_filename = "bakingqueen74_links.txt"
     
-    category_urls = get_category_links(start_url)
-    
-    if not category_urls:
-        print("Scraping stopped because no category URLs were found.")
-        return
+    # One shared session for every category; limit_per_host keeps the overlap polite.
+    # Idle connections and DNS answers outlive the 1s pauses, so every page after the
+    # first reuses a warm keep-alive connection instead of a fresh TCP+TLS handshake
+    connector = aiohttp.TCPConnector(limit_per_host=4, keepalive_timeout=30, ttl_dns_cache=300)
+    timeout = aiohttp.ClientTimeout(total=15)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={'User-Agent': 'Mozilla/5.0'}) as session:
+        category_urls = await get_category_links(session, start_url)
+        
+        if not category_urls:
+            print("Scraping stopped because no category URLs were found.")
+            return
 
-    tracked_links = set()
-    
-    try:
-        with open(output_filename, 'w', encoding='utf-8') as file_handler:
-            for url in category_urls:
-                scrape_recipes_in_category(url, file_handler, tracked_links)
-                
-        print(f"\nScraping complete. Found and saved {len(tracked_links)} unique recipe links.")
-        print(f"All links have been written to '{output_filename}'")
+        # A Bloom filter costs a couple of bytes per link instead of a full str in a set;
+        # a rare false positive only skips a link. len() on it is an estimate, so count writes separately
+        tracked_links = ScalableBloomFilter(initial_capacity=10000, error_rate=0.001)
         
-    except IOError as e:
-        print(f"Fatal Error: Could not open or write to file '{output_filename}': {e}")
+        try:
+            with open(output_filename, 'w', encoding='utf-8') as file_handler:
+                # Scrape up to MAX_CATEGORY_WORKERS categories concurrently; each still pages
+                # through in order and sleeps between its own pages
+                category_slots = asyncio.Semaphore(MAX_CATEGORY_WORKERS)
+
+                async def scrape_bounded(url):
+                    async with category_slots:
+                        return await scrape_recipes_in_category(session, url, file_handler, tracked_links)
+
+                written_counts = await asyncio.gather(*[
+                    scrape_bounded(url) for url in category_urls
+                ])
+                    
+            print(f"\nScraping complete. Found and saved {sum(written_counts)} unique recipe links.")
+            print(f"All links have been written to '{output_filename}'")
+            
+        except IOError as e:
+            print(f"Fatal Error: Could not open or write to file '{output_filename}': {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -4,10 +4,12 @@ import json
 import os
 import re
 from datetime import datetime
-from typing import Set
+from typing import Set, Optional
 
 # --- Core Libraries ---
 import aiofiles
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 from playwright.async_api import async_playwright, Page, BrowserContext, TimeoutError
 
 # --- Configuration ---
@@ -16,6 +18,8 @@ DELIVERY_VERSION = "V1.0"
 CONCURRENT_WORKERS = 1 # Set to 1 for single-article scraping
 MIN_CHAR_COUNT = 200
 USER_AGENT = "Mozilla/5.0 (Windows NT 1.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36"
+BLOCKED_RESOURCE_TYPES = frozenset({"stylesheet", "font", "media", "script"})
+ARTICLE_BODY_SELECTOR = "article.type-post div.entry-content" # Present when the recipe is server-rendered
 
 # --- Single Article URL for Testing ---
 # ⚠️ Replace this with a real article URL from acozykitchen.com to test 
@@ -25,36 +29,80 @@ SINGLE_ARTICLE_URL = "https://www.acozykitchen.com/pumpkin-cream-cheese-muffins"
 LINKS_FILE = "test_link_to_scrape.jsonl"
 OUTPUT_FILE = f"test_data.jsonl" # Changed output file for clarity
 
+# --- Precompiled Patterns ---
+# Compiled once at import time; clean_simple_text runs for every scraped article.
+# The original emoji blocks overlap: flags (1F1E0-1F1FF) and dingbats (2702-27B0)
+# already sit inside 24C2-1F251, and 1F300-1F5FF / 1F600-1F64F are adjacent.
+# Merged into three disjoint ranges so the charset check does fewer comparisons.
+_EMOJI_RE = re.compile(
+    r' ?['
+    "\U000024C2-\U0001F251"  # enclosed chars, dingbats, flags, etc.
+    "\U0001F300-\U0001F64F"  # symbols & pictographs, emoticons
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    r']+',
+    flags=re.UNICODE
+)
+# "url" only appears as a key under meta.data_info; quotes inside text fields are escaped
+_URL_FIELD_RE = re.compile(rb'"url":\s*"([^"]+)"')
+
 # --- Helper Functions ---
 
 def generate_id(url: str) -> str:
     """Generates an MD5 hash for a given URL."""
-    return hashlib.md5(url.encode('utf-8')).hexdigest()
+    # Nearly every URL is ASCII, which encodes identically under both codecs; keep
+    # UTF-8 for the rest so IDs stay stable instead of dropping characters.
+    data = url.encode('ascii') if url.isascii() else url.encode('utf-8')
+    return hashlib.md5(data, usedforsecurity=False).hexdigest()
 
 def clean_simple_text(text: str) -> str:
     """Removes extra whitespace, normalizes line breaks, and removes emojis (and the preceding space)."""
     if not text: return ""
-    cleaned = '\n'.join(line.strip() for line in text.split('\n') if line.strip())
-    cleaned = re.sub(r'\n{2,}', '\n', cleaned)
-    
-    # Define the emoji pattern
-    emoji_chars = (
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-        "\U00002702-\U000027B0"
-        "\U000024C2-\U0001F251"
-    )
-    # Emoji Removal including preceding space
-    emoji_pattern_with_space = re.compile(
-        r' ?[' + emoji_chars + r']+', 
-        flags=re.UNICODE
-    )
-    cleaned = emoji_pattern_with_space.sub(r'', cleaned)
+    # Strip each line once and keep only non-empty ones; joining them can never
+    # produce consecutive newlines, so no separate collapsing pass is needed.
+    lines = []
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if stripped: lines.append(stripped)
+    cleaned = '\n'.join(lines)
+    # Pure-ASCII text cannot contain any of the emoji ranges, so skip the regex pass
+    if cleaned.isascii(): return cleaned
+    cleaned = _EMOJI_RE.sub('', cleaned)
     
     return cleaned
 
+def count_text_chars(text: str) -> int:
+    """Returns the character count of text with any [image: ...] placeholders excluded."""
+    count = len(text.strip())
+    i = 0
+    while True:
+        start = text.find('[image:', i)
+        if start < 0: break
+        end = text.find(']', start)
+        if end < 0: break
+        count -= end - start + 1
+        i = end + 1
+    return count
+
+async def block_non_essential_resources(route):
+    """Route handler that aborts non-essential resources to speed up page loads."""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+async def fetch_static(session: aiohttp.ClientSession, url: str) -> Optional[str]:
+    """Fetches server-rendered HTML, returning None unless it already contains the article body."""
+    try:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as response:
+            if response.status != 200:
+                return None
+            html = await response.text()
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return None
+    if LexborHTMLParser(html).css_first(ARTICLE_BODY_SELECTOR) is None:
+        return None
+    return html
+
 # --- Core Scraping and State Management Functions ---
 
 # Removed collect_all_article_links as it is no longer needed.
@@ -65,22 +113,27 @@ async def get_scraped_urls(file_path: str) -> Set[str]:
     if not os.path.exists(file_path):
         return scraped_urls
     
-    async with aiofiles.open(file_path, mode='r', encoding='utf-8') as f:
-        async for line in f:
-            try:
-                data = json.loads(line)
-                url = data.get("meta", {}).get("data_info", {}).get("url")
-                if url: scraped_urls.add(url)
-            except (json.JSONDecodeError, KeyError):
-                continue
+    # Only the url field is needed, so pull it straight from the raw bytes
+    # instead of decoding every stored article with json.loads.
+    async with aiofiles.open(file_path, mode='rb') as f:
+        buf = await f.read()
+    for match in _URL_FIELD_RE.finditer(buf):
+        scraped_urls.add(match.group(1).decode('utf-8'))
     return scraped_urls
 
 
-async def scrape_article_page(page: Page, url: str, lock: asyncio.Lock):
+async def scrape_article_page(page: Page, url: str, lock: asyncio.Lock, out_file, processing_date: str, http_session: aiohttp.ClientSession):
     """Scrapes, processes, and saves data from a single article page."""
     try:
-        print(f"🌍 Navigating to: {url}")
-        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        # Scripts are blocked in the browser anyway, so when the server already renders
+        # the article we load that HTML directly and skip Chromium's own navigation.
+        html = await fetch_static(http_session, url)
+        if html:
+            print(f"📄 Loaded static HTML for: {url}")
+            await page.set_content(html, wait_until="domcontentloaded", timeout=60000)
+        else:
+            print(f"🌍 Navigating to: {url}")
+            await page.goto(url, wait_until="domcontentloaded", timeout=60000)
         
         article_data = await page.evaluate("""() => {
             const getBestSrc = (el) => {
@@ -100,6 +153,23 @@ async def scrape_article_page(page: Page, url: str, lock: asyncio.Lock):
             // Helper to parse the structured recipe card
             const parseRecipeCard = (container) => {
                 const recipeParts = [];
+                // Walks groups, group titles and items with one document-ordered query per section
+                const pushGroups = (section, kind, itemClass, formatItem) => {
+                    let items = [];
+                    const flush = () => {
+                        if (items.length > 0) recipeParts.push(items.join('\\n'));
+                        items = [];
+                    };
+                    const groupClass = `wprm-recipe-${kind}-group`;
+                    const titleClass = `wprm-recipe-${kind}-group-name`;
+                    for (const el of section.querySelectorAll(`.${groupClass}, .${titleClass}, .${itemClass}`)) {
+                        const classes = el.classList;
+                        if (classes.contains(groupClass)) flush();
+                        else if (classes.contains(titleClass)) recipeParts.push(el.textContent.trim());
+                        else items.push(formatItem(el, items.length));
+                    }
+                    flush();
+                };
                 const recipeTitle = container.querySelector('.wprm-recipe-name')?.textContent.trim();
                 if (recipeTitle) recipeParts.push(`${recipeTitle}`);
                 
@@ -116,28 +186,14 @@ async def scrape_article_page(page: Page, url: str, lock: asyncio.Lock):
                 const ingredientsSection = container.querySelector('.wprm-recipe-ingredients-container');
                 if (ingredientsSection) {
                     recipeParts.push(`Ingredients`);
-                    const groups = ingredientsSection.querySelectorAll('.wprm-recipe-ingredient-group');
-                    groups.forEach(group => {
-                        const groupTitle = group.querySelector('.wprm-recipe-ingredient-group-name');
-                        if (groupTitle) recipeParts.push(`${groupTitle.textContent.trim()}`);
-                        const items = Array.from(group.querySelectorAll('.wprm-recipe-ingredient'))
-                                           .map(el => `- ${el.textContent.replace(/▢/g, '').trim()}`);
-                        if (items.length > 0) recipeParts.push(items.join('\\n'));
-                    });
+                    pushGroups(ingredientsSection, 'ingredient', 'wprm-recipe-ingredient', el => `- ${el.textContent.replace(/▢/g, '').trim()}`);
                 }
                 
                 // --- Instructions ---
                 const instructionsSection = container.querySelector('.wprm-recipe-instructions-container');
                 if (instructionsSection) {
                     recipeParts.push(` Instructions`);
-                    const groups = instructionsSection.querySelectorAll('.wprm-recipe-instruction-group');
-                    groups.forEach(group => {
-                        const groupTitle = group.querySelector('.wprm-recipe-instruction-group-name');
-                        if (groupTitle) recipeParts.push(`${groupTitle.textContent.trim()}`);
-                        const items = Array.from(group.querySelectorAll('.wprm-recipe-instruction-text'))
-                                           .map((el, index) => `${index + 1}. ${el.textContent.trim()}`);
-                        if (items.length > 0) recipeParts.push(items.join('\\n'));
-                    });
+                    pushGroups(instructionsSection, 'instruction', 'wprm-recipe-instruction-text', (el, index) => `${index + 1}. ${el.textContent.trim()}`);
                 }
                 
                 // --- Notes ---
@@ -247,10 +303,10 @@ async def scrape_article_page(page: Page, url: str, lock: asyncio.Lock):
 
         full_content = article_data['fullContent']
         title = article_data['title']
-        text_for_char_count = re.sub(r'\[image:.*?\]', '', article_data['textOnlyContent']).strip()
+        char_count = count_text_chars(article_data['textOnlyContent'])
 
-        if len(text_for_char_count) < MIN_CHAR_COUNT:
-            print(f"🔻 Skipped '{title[:40]}...': Not enough content ({len(text_for_char_count)} chars).")
+        if char_count < MIN_CHAR_COUNT:
+            print(f"🔻 Skipped '{title[:40]}...': Not enough content ({char_count} chars).")
             return
 
         cleaned_content = clean_simple_text(full_content)
@@ -261,7 +317,7 @@ async def scrape_article_page(page: Page, url: str, lock: asyncio.Lock):
             "meta": {
                 "data_info": {
                     "lang": "en", "url": url, "source": WEBSITE_NAME,
-                    "type": "Article", "processing_date": datetime.now().strftime("%Y-%m-%d"),
+                    "type": "Article", "processing_date": processing_date,
                     "delivery_version": DELIVERY_VERSION, "title": title, "content": cleaned_content,
                     "content_info": {
                         "domain": "daily_life",
@@ -272,24 +328,21 @@ async def scrape_article_page(page: Page, url: str, lock: asyncio.Lock):
         }
         
         async with lock:
-            async with aiofiles.open(OUTPUT_FILE, mode='a', encoding='utf-8') as f:
-                await f.write(json.dumps(final_data, ensure_ascii=False) + "\n")
+            await out_file.write(json.dumps(final_data, ensure_ascii=False) + "\n")
         
-        print(f"✅ Success: Saved '{title[:40]}...' (Length: {len(text_for_char_count)}) to {OUTPUT_FILE}")
+        print(f"✅ Success: Saved '{title[:40]}...' (Length: {char_count}) to {OUTPUT_FILE}")
 
     except Exception as e:
         print(f"❌ Error on article '{url}': {str(e)[:150]}...")
 
 
-async def worker(context: BrowserContext, queue: asyncio.Queue, lock: asyncio.Lock):
+async def worker(context: BrowserContext, queue: asyncio.Queue, lock: asyncio.Lock, out_file, processing_date: str, http_session: aiohttp.ClientSession):
     """A worker that continuously fetches tasks from the queue and scrapes them."""
     while True:
         url = await queue.get()
         page = await context.new_page()
         try:
-            # Abort non-essential resources to speed up single-page load
-            await page.route("**/*", lambda route: route.abort() if route.request.resource_type in ["stylesheet", "font", "media", "script"] else route.continue_())
-            await scrape_article_page(page, url, lock)
+            await scrape_article_page(page, url, lock, out_file, processing_date, http_session)
         finally:
             await page.close()
             queue.task_done()
@@ -312,19 +365,28 @@ async def main():
         print("\n🚀 Starting single-article scraping phase...")
 
         file_lock = asyncio.Lock()
+        # Every article in a run shares the same processing date
+        processing_date = datetime.now().strftime("%Y-%m-%d")
         queue = asyncio.Queue()
         queue.put_nowait(SINGLE_ARTICLE_URL) # Add the single URL to the queue
 
-        worker_contexts = [await browser.new_context(user_agent=USER_AGENT) for _ in range(CONCURRENT_WORKERS)]
-        # Start a single worker since CONCURRENT_WORKERS is set to 1, but keep the structure
-        tasks = [asyncio.create_task(worker(worker_contexts[i], queue, file_lock)) for i in range(CONCURRENT_WORKERS)]
-
-        await queue.join()
-
-        for task in tasks: task.cancel()
-        await asyncio.gather(*tasks, return_exceptions=True)
+        # One shared context (cookie jar, HTTP cache) for all workers; each worker opens its own pages in it
+        context = await browser.new_context(user_agent=USER_AGENT)
+        # Abort non-essential resources once; applies to every page the context opens
+        await context.route("**/*", block_non_essential_resources)
+        # One long-lived handle for the whole run; the lock keeps lines from interleaving
+        # A single aiohttp session serves the static prefetch for every worker.
+        async with aiofiles.open(OUTPUT_FILE, mode='a', encoding='utf-8') as out_file, \
+                   aiohttp.ClientSession(headers={"User-Agent": USER_AGENT}) as http_session:
+            # Start a single worker since CONCURRENT_WORKERS is set to 1, but keep the structure
+            tasks = [asyncio.create_task(worker(context, queue, file_lock, out_file, processing_date, http_session)) for _ in range(CONCURRENT_WORKERS)]
+
+            await queue.join()
+
+            for task in tasks: task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
         
-        for ctx in worker_contexts: await ctx.close()
+        await context.close()
         await browser.close()
 
     print(f"\n✨ Scraping complete. Data saved to '{OUTPUT_FILE}'")
@@ -1,10 +1,16 @@
 import re
-import json
 import os
 
+import orjson
+
 # --- Configuration ---
 INPUT_FILE = "acozy_not_cleaned.jsonl"
 OUTPUT_FILE = "acozy_data_CLEANED.jsonl"
+WRITE_BATCH_SIZE = 4096 # Lines buffered before each write to the output file
+
+# --- Precompiled Patterns ---
+# Prioritize lazy-loading sources, then the standard src
+SRC_ATTR_REGEX = re.compile(r'(?:data-lazy-src|src)="([^"]+)"')
 
 def format_image_tag(match):
     """
@@ -13,8 +19,7 @@ def format_image_tag(match):
     """
     tag_string = match.group(0) # The full <img> tag HTML
     
-    # Prioritize lazy-loading sources, then the standard src
-    src_match = re.search(r'(?:data-lazy-src|src)="([^"]+)"', tag_string)
+    src_match = SRC_ATTR_REGEX.search(tag_string)
     
     if src_match:
         url = src_match.group(1)
@@ -39,12 +44,14 @@ def clean_file(input_path, output_path):
     # The re.DOTALL flag allows '.' to match newline characters, catching multi-line iframes
     iframe_tag_regex = re.compile(r'<iframe.*?</iframe>', re.DOTALL)
 
-    with open(input_path, 'r', encoding='utf-8') as infile, \
-         open(output_path, 'w', encoding='utf-8') as outfile:
+    # Both files are handled as raw UTF-8 bytes; orjson parses and serializes them directly
+    with open(input_path, 'rb') as infile, \
+         open(output_path, 'wb', buffering=1 << 20) as outfile:
         
+        batch = []
         for line in infile:
             try:
-                data = json.loads(line)
+                data = orjson.loads(line)
 
                 # Check if 'Text' field exists
                 if 'Text' in data:
@@ -63,13 +70,20 @@ def clean_file(input_path, output_path):
 
                     data['Text'] = processed_text
                     
-                # Write the (potentially modified) data to the new file
-                outfile.write(json.dumps(data, ensure_ascii=False) + '\n')
+                # Queue the (potentially modified) data; written out in batches
+                batch.append(orjson.dumps(data))
                 cleaned_lines += 1
+                if len(batch) >= WRITE_BATCH_SIZE:
+                    outfile.write(b'\n'.join(batch) + b'\n')
+                    batch.clear()
 
-            except json.JSONDecodeError:
-                print(f"Warning: Skipping a malformed line: {line.strip()}")
+            except orjson.JSONDecodeError:
+                print(f"Warning: Skipping a malformed line: {line.strip().decode('utf-8', 'replace')}")
                 continue
+
+        # Flush whatever is left over from the last partial batch
+        if batch:
+            outfile.write(b'\n'.join(batch) + b'\n')
                 
     print(f"\n✨ Done! Cleaned {cleaned_lines} articles.")
     print(f"Formatted data saved to: {output_path}")
@@ -1,38 +1,57 @@
-import requests
-from bs4 import BeautifulSoup
-import time
+import asyncio
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 
+MAX_CONCURRENCY = 16  # In-flight page fetches; keeps load on the server bounded
 
-def get_blog_urls_simple():
+
+async def fetch(session, sem, url):
+    """Fetch a page body, holding a semaphore slot for the whole request"""
+    async with sem:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            return await response.read()
+
+
+async def get_blog_urls_simple():
     """Simple function to get all blog URLs"""
     urls = []
 
+    listing_urls = []
     for page in range(1, 73):  # Pages 1 to 72
         if page == 1:
-            url = "https://adventurousmiriam.com/blog/"
+            listing_urls.append("https://adventurousmiriam.com/blog/")
         else:
-            url = f"https://adventurousmiriam.com/blog/page/{page}/"
+            listing_urls.append(f"https://adventurousmiriam.com/blog/page/{page}/")
 
+    # Fetch every page concurrently on one keep-alive connection pool
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        pages = await asyncio.gather(
+            *(fetch(session, sem, url) for url in listing_urls), return_exceptions=True
+        )
+
+    # Parse them in page order
+    for page, body in enumerate(pages, 1):
         print(f"Checking page {page}...")
 
+        if isinstance(body, Exception):
+            print(f"Error on page {page}: {body}")
+            break
+
         try:
-            response = requests.get(url)
-            soup = BeautifulSoup(response.content, "html.parser")
+            tree = LexborHTMLParser(body)
 
-            # Find all article links
-            articles = soup.find_all("article", class_="kt-blocks-post-grid-item")
+            # Find all article links in one selector pass
+            links = tree.css("article.kt-blocks-post-grid-item h2.entry-title a[href]")
 
-            if not articles:
+            if not links:
                 print(f"No more articles found. Stopped at page {page-1}")
                 break
 
-            for article in articles:
-                link = article.find("h2", class_="entry-title").find("a")
-                if link and link.get("href"):
-                    urls.append(link["href"])
+            urls.extend(link.attributes["href"] for link in links)
 
-            print(f"Found {len(articles)} articles on page {page}")
-            time.sleep(0.5)  # Be nice to the server
+            print(f"Found {len(links)} articles on page {page}")
 
         except Exception as e:
             print(f"Error on page {page}: {e}")
@@ -49,4 +68,4 @@ def get_blog_urls_simple():
 
 # Run the simple version
 if __name__ == "__main__":
-    urls = get_blog_urls_simple()
+    urls = asyncio.run(get_blog_urls_simple())
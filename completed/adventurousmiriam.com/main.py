@@ -1,11 +1,15 @@
 import time
 import re
 import json
+import orjson
 import hashlib
+import queue
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 from playwright.sync_api import sync_playwright
 from bs4 import BeautifulSoup
+import soupsieve as sv
 
 # --- Configuration ---
 INPUT_FILE = 'blog_urls.txt'
@@ -14,50 +18,81 @@ WEBSITE_NAME = 'adventurousmiriam.com'
 DELIVERY_VERSION = 'V1.0'
 MAX_WORKERS = 5
 DEBUG_SAVE_HTML = False
+LOAD_WAIT_TIMEOUT_MS = 5000  # Upper bound on waiting for the page to finish loading
+WRITE_BATCH_SIZE = 32  # Completed articles buffered per output write
+PROCESSING_DATE = datetime.now().strftime("%Y-%m-%d")  # Stamped on every article of this run
+BROWSER_POOL_RECYCLE_AFTER = 100  # Contexts served by one browser before it is relaunched
+# Lean headless Chromium: no GPU, extensions or background services
+CHROMIUM_ARGS = [
+    '--no-sandbox', '--disable-gpu', '--disable-dev-shm-usage', '--disable-extensions',
+    '--disable-background-networking', '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-features=Translate,BackForwardCache,MediaRouter',
+    '--mute-audio', '--no-first-run', '--no-zygote',
+]
+
+_EMOJI_RE = re.compile("[" u"\U0001F600-\U0001F64F" u"\U0001F300-\U0001F5FF" u"\U0001F680-\U0001F6FF" u"\U0001F1E0-\U0001F1FF" u"\U00002702-\U000027B0" u"\U000024C2-\U0001F251" "]+", flags=re.UNICODE)
+# Emails are masked first so a phone match can't eat part of an address
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,7}\b')
+_PHONE_RE = re.compile(r'(\(?\d{3}\)?[\s.-]?)?\d{3}[\s.-]?\d{4}')
+_MULTISPACE_RE = re.compile(r' +')
+_MULTINL_RE = re.compile(r'\n{2,}')
+_PUNCT_TABLE = str.maketrans({'’': "'", '‘': "'", '“': '"', '”': '"', '…': '...', '–': '-', '—': '-'})
+# "url" only occurs as a key in meta.data_info; inside article text quotes are escaped
+_URL_IN_LINE = re.compile(rb'"url"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+_ARTICLE_SEL = sv.compile('article.post')
+_TITLE_SEL = sv.compile('h1.entry-title')
+_CONTENT_SEL = sv.compile('.entry-content')
+_REMOVE_SELECTORS = [sv.compile(selector) for selector in [
+    '.entry-taxonomies', '.entry-meta', '.kb-table-of-content-nav', '.dpsp-shortcode-wrapper',
+    '.mailmunch-forms-before-post', '.mv-ad-box', '#rank-math-faq',
+    'p.has-theme-palette-7-background-color',
+    '.kb-row-layout-id51495_5c8313-bd',
+]]
 
 def normalize_text(text: str) -> str:
     """Handles basic text normalization for punctuation, emojis, and whitespace."""
     if not isinstance(text, str): return ""
-    text = text.replace('’', "'").replace('‘', "'").replace('“', '"').replace('”', '"')
-    text = text.replace('…', '...').replace('–', '-').replace('—', '-')
-    emoji_pattern = re.compile("[" u"\U0001F600-\U0001F64F" u"\U0001F300-\U0001F5FF" u"\U0001F680-\U0001F6FF" u"\U0001F1E0-\U0001F1FF" u"\U00002702-\U000027B0" u"\U000024C2-\U0001F251" "]+", flags=re.UNICODE)
-    text = emoji_pattern.sub(r'', text)
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n{2,}', '\n', text)
+    text = text.translate(_PUNCT_TABLE)
+    text = _EMOJI_RE.sub(r'', text)
+    text = _MULTISPACE_RE.sub(' ', text)
+    text = _MULTINL_RE.sub('\n', text)
     return text.strip()
 
 def anonymize_text(text: str) -> str:
-    """Anonymizes PII like emails and phone numbers."""
+    """Anonymizes PII like emails and phone numbers.
+
+    >>> anonymize_text("Reach (555) 123-4567bob@site.org")
+    'Reach (555) xxxxxxxxxxxxxxxxxxxx'
+    >>> anonymize_text("555 1234567a@b.co")
+    '555 xxxxxxxxxxxxx'
+    """
     if not isinstance(text, str): return ""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
-    text = re.sub(email_pattern, lambda m: 'x' * len(m.group()), text)
-    phone_pattern = r'(\(?\d{3}\)?[\s.-]?)?\d{3}[\s.-]?\d{4}'
-    text = re.sub(phone_pattern, lambda m: 'x' * len(m.group()), text)
+    text = _EMAIL_RE.sub(lambda m: 'x' * len(m.group()), text)
+    text = _PHONE_RE.sub(lambda m: 'x' * len(m.group()), text)
     return text
 
 def parse_html_content(html: str, url: str) -> dict | None:
     """Parses the full HTML content using BeautifulSoup."""
-    soup = BeautifulSoup(html, 'html.parser')
-    article_container = soup.select_one('article.post')
+    # Substring guard: skips non-article pages without a parse of their own
+    if '<article' not in html or 'entry-title' not in html:
+        return None
+    soup = BeautifulSoup(html, 'lxml')
+    article_container = _ARTICLE_SEL.select_one(soup)
     if not article_container:
         return None
 
-    selectors_to_remove = [
-        '.entry-taxonomies', '.entry-meta', '.kb-table-of-content-nav', '.dpsp-shortcode-wrapper',
-        '.mailmunch-forms-before-post', '.mv-ad-box', '#rank-math-faq', 
-        'p.has-theme-palette-7-background-color',
-        '.kb-row-layout-id51495_5c8313-bd'
-    ]
-    for selector in selectors_to_remove:
-        for element in article_container.select(selector):
+    for selector in _REMOVE_SELECTORS:
+        for element in selector.select(article_container):
             element.decompose()
 
     content_parts = []
-    title_tag = article_container.select_one('h1.entry-title')
+    title_tag = _TITLE_SEL.select_one(article_container)
     if not title_tag: return None
     title = title_tag.get_text(strip=True)
 
-    content_area = article_container.select_one('.entry-content')
+    content_area = _CONTENT_SEL.select_one(article_container)
     if not content_area: return None
     
     for element in content_area.find_all(['p', 'h2', 'h3', 'ul', 'figure']):
@@ -82,52 +117,142 @@ def parse_html_content(html: str, url: str) -> dict | None:
     
     if len(cleaned_content) < 200: return None
     
-    processing_date = datetime.now().strftime("%Y-%m-%d")
-    data = {"ID": hashlib.md5(url.encode('utf-8')).hexdigest(), "Text": f"{normalized_title}\n{cleaned_content}", "meta": {"data_info": {"lang": "en", "url": url, "source": WEBSITE_NAME, "type": "Blog", "processing_date": processing_date, "delivery_version": DELIVERY_VERSION, "title": normalized_title, "content": cleaned_content, "content_info": {"domain": "daily_life", "subdomain": "Travel"}}} }
+    data = {"ID": hashlib.md5(url.encode('utf-8'), usedforsecurity=False).hexdigest(), "Text": f"{normalized_title}\n{cleaned_content}", "meta": {"data_info": {"lang": "en", "url": url, "source": WEBSITE_NAME, "type": "Blog", "processing_date": PROCESSING_DATE, "delivery_version": DELIVERY_VERSION, "title": normalized_title, "content": cleaned_content, "content_info": {"domain": "daily_life", "subdomain": "Travel"}}} }
     return data
 
-def scrape_url_task(url: str):
-    """Main scraping task executed by each process."""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+# Only the HTML is parsed, so everything else is dropped
+BLOCKED_RESOURCE_TYPES = frozenset({"stylesheet", "font", "media", "image", "other"})
+BLOCKED_HOSTS = (
+    "doubleclick.net", "googlesyndication.com", "googletagmanager.com",
+    "google-analytics.com", "googleadservices.com", "facebook.net", "facebook.com",
+    "amazon-adsystem.com", "adthrive.com", "mediavine.com", "pinterest.com", "hotjar.com",
+)
+_BLOCKED_HOST_SUFFIXES = tuple("." + host for host in BLOCKED_HOSTS)
+
+def block_unneeded_requests(route):
+    """Playwright route handler aborting heavy resources and ad/analytics hosts."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return route.abort()
+    host = urlparse(request.url).hostname or ""
+    if ("." + host).endswith(_BLOCKED_HOST_SUFFIXES):
+        return route.abort()
+    return route.continue_()
+
+class BrowserPool:
+    """One worker thread's Chromium, kept alive across URLs.
+
+    Playwright's sync objects can only be used (and closed) from the thread that
+    created them, so every worker owns its pool and closes it on the way out.
+    """
+
+    def __init__(self, recycle_after: int = BROWSER_POOL_RECYCLE_AFTER):
+        self.recycle_after = recycle_after
+        self.playwright = None
+        self.browser = None
+        self.contexts_served = 0
+
+    def _launch(self):
+        if self.playwright is None:
+            self.playwright = sync_playwright().start()
         try:
-            page.route("**/*", lambda route: route.abort() if route.request.resource_type in {"stylesheet", "font", "media"} else route.continue_())
-            page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            for _ in range(3):
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(0.5)
-            html = page.content()
-            if DEBUG_SAVE_HTML:
-                filename = re.sub(r'[\\/*?:"<>|]', "", url.replace("https://", "").replace("http://", "").replace("/", "_")) + ".html"
-                with open(filename, 'w', encoding='utf-8') as f: f.write(html)
-                print(f"🐛 DEBUG: Saved raw HTML for {url} to '{filename}'")
-            return parse_html_content(html, url)
-        finally:
-            page.close()
-            browser.close()
+            self.browser = self.playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+        except Exception:
+            # Don't leak the driver when the browser fails to start
+            self.playwright.stop()
+            self.playwright = None
+            raise
+        self.contexts_served = 0
+
+    def acquire(self):
+        if self.browser is None:
+            self._launch()
+        elif self.contexts_served >= self.recycle_after or not self.browser.is_connected():
+            # Relaunch periodically, or after a crash
+            try: self.browser.close()
+            except Exception: pass
+            self.browser = None
+            self._launch()
+        self.contexts_served += 1
+        return self.browser.new_context()
+
+    def release(self, ctx):
+        ctx.close()
+
+    def close(self):
+        """Best-effort: a browser that already died must not keep the driver alive."""
+        if self.browser is not None:
+            try: self.browser.close()
+            except Exception: pass
+            self.browser = None
+        if self.playwright is not None:
+            try: self.playwright.stop()
+            except Exception: pass
+            self.playwright = None
+
+def scrape_url_task(url: str, pool: BrowserPool):
+    """Main scraping task executed by each worker thread."""
+    ctx = pool.acquire()
+    page = ctx.new_page()
+    try:
+        page.route("**/*", block_unneeded_requests)
+        page.goto(url, wait_until='domcontentloaded', timeout=60000)
+        # Wait for load rather than a fixed sleep; lazy image URLs are in the markup
+        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        try: page.wait_for_function("document.readyState === 'complete'", timeout=LOAD_WAIT_TIMEOUT_MS)
+        except Exception: pass
+        html = page.content()
+        if DEBUG_SAVE_HTML:
+            filename = re.sub(r'[\\/*?:"<>|]', "", url.replace("https://", "").replace("http://", "").replace("/", "_")) + ".html"
+            with open(filename, 'w', encoding='utf-8') as f: f.write(html)
+            print(f"🐛 DEBUG: Saved raw HTML for {url} to '{filename}'")
+        return parse_html_content(html, url)
+    finally:
+        page.close()
+        pool.release(ctx)
+
+def scrape_worker(urls: queue.SimpleQueue, results: queue.SimpleQueue):
+    """Scrapes URLs off the shared queue with one browser until the queue is empty."""
+    pool = BrowserPool()
+    try:
+        while True:
+            try: url = urls.get_nowait()
+            except queue.Empty: return
+            try: results.put((url, scrape_url_task(url, pool), None))
+            except Exception as exc: results.put((url, None, exc))
+    finally:
+        pool.close()
 
 def main():
     """Main function to run the concurrent scraper with resume capability."""
     # --- Resume Logic ---
     scraped_urls = set()
     try:
-        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f_out:
+        # Pull just the URL out of each line; lines cut off mid-write are skipped
+        with open(OUTPUT_FILE, 'rb') as f_out:
             for line in f_out:
-                try:
-                    data = json.loads(line)
-                    scraped_urls.add(data['meta']['data_info']['url'])
-                except (json.JSONDecodeError, KeyError):
-                    continue 
+                if not line.rstrip().endswith(b'}'):
+                    continue
+                m = _URL_IN_LINE.search(line)
+                if m:
+                    url = m.group(1)
+                    scraped_urls.add(json.loads(b'"' + url + b'"').encode('utf-8') if b'\\' in url else url)
         print(f"Found {len(scraped_urls)} already scraped URLs. Resuming...")
     except FileNotFoundError:
         print("Output file not found. Starting a new scrape.")
 
     # --- Read and Filter URLs ---
     try:
-        with open(INPUT_FILE, 'r', encoding='utf-8') as f_in:
-            all_urls = {line.strip() for line in f_in if line.strip()}
-            urls_to_scrape = list(all_urls - scraped_urls)
+        total_urls = 0
+        pending = {}  # dict keeps file order and drops duplicate lines
+        with open(INPUT_FILE, 'rb') as f_in:
+            for line in f_in:
+                url = line.strip()
+                if url:
+                    total_urls += 1
+                    if url not in scraped_urls:
+                        pending[url] = None
+        urls_to_scrape = [url.decode('utf-8') for url in pending]
     except FileNotFoundError:
         print(f"Error: Input file '{INPUT_FILE}' not found. Please create it.")
         return
@@ -136,25 +261,37 @@ def main():
         print("All URLs from the input file have already been scraped. Nothing to do.")
         return
 
-    print(f"Total URLs in file: {len(all_urls)}. Remaining to scrape: {len(urls_to_scrape)}.")
+    print(f"Total URLs in file: {total_urls}. Remaining to scrape: {len(urls_to_scrape)}.")
     start_time = time.time()
     scraped_count = 0
     
-    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_url = {executor.submit(scrape_url_task, url): url for url in urls_to_scrape}
-        with open(OUTPUT_FILE, 'a', encoding='utf-8') as f_out:
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    article_data = future.result()
-                    if article_data:
-                        f_out.write(json.dumps(article_data, ensure_ascii=False) + '\n')
+    urls = queue.SimpleQueue()
+    for url in urls_to_scrape:
+        urls.put(url)
+    results = queue.SimpleQueue()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for _ in range(MAX_WORKERS):
+            executor.submit(scrape_worker, urls, results)
+        write_buf = []
+        with open(OUTPUT_FILE, 'ab') as f_out:
+            try:
+                # One result per URL, scraped or failed
+                for _ in range(len(urls_to_scrape)):
+                    url, article_data, exc = results.get()
+                    if exc is not None:
+                        print(f"❌ ERROR: {url} generated an exception: {exc}")
+                    elif article_data:
+                        write_buf.append(orjson.dumps(article_data) + b'\n')
+                        if len(write_buf) >= WRITE_BATCH_SIZE:
+                            f_out.write(b''.join(write_buf))
+                            write_buf.clear()
+                            f_out.flush()
                         scraped_count += 1
                         print(f"✅ SUCCESS: Scraped {url}")
                     else:
                         print(f"⏭️ SKIPPED: {url} (No data or content too short after cleaning)")
-                except Exception as exc:
-                    print(f"❌ ERROR: {url} generated an exception: {exc}")
+            finally:
+                f_out.write(b''.join(write_buf))
 
     end_time = time.time()
     total_time = end_time - start_time
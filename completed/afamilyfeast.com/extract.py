@@ -1,46 +1,63 @@
-import requests
-from bs4 import BeautifulSoup
-import time
+import asyncio
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
 
+MAX_CONCURRENCY = 16  # In-flight page fetches; keeps load on the server bounded
 
-def quick_scrape_afamilyfeast():
+
+async def fetch(session, sem, url):
+    """Fetch a page body, holding a semaphore slot for the whole request"""
+    async with sem:
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+            return await response.read()
+
+
+async def quick_scrape_afamilyfeast():
     """Quick scraper for A Family Feast URLs only"""
     all_urls = []
 
+    listing_urls = []
     for page in range(1, 170):
         if page == 1:
-            url = "https://www.afamilyfeast.com/blog/"
+            listing_urls.append("https://www.afamilyfeast.com/blog/")
         else:
-            url = f"https://www.afamilyfeast.com/blog/page/{page}/"
+            listing_urls.append(f"https://www.afamilyfeast.com/blog/page/{page}/")
+
+    # Fetch every page concurrently on one keep-alive connection pool
+    sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    connector = aiohttp.TCPConnector(limit=32, keepalive_timeout=30)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        pages = await asyncio.gather(
+            *(fetch(session, sem, url) for url in listing_urls), return_exceptions=True
+        )
 
+    # Parse them in page order
+    for page, (url, body) in enumerate(zip(listing_urls, pages), 1):
         print(f"Page {page}: {url}")
 
+        if isinstance(body, Exception):
+            print(f"  Error: {body}")
+            continue
+
         try:
-            response = requests.get(url, timeout=10)
-            soup = BeautifulSoup(response.content, "html.parser")
+            tree = LexborHTMLParser(body)
 
-            # Find all recipe articles in the main content
-            main_content = soup.find("main", class_="content")
+            # Find all recipe title links in the main content in one selector pass
+            main_content = tree.css_first("main.content")
             if main_content:
-                articles = main_content.find_all("article", class_="post")
+                title_links = main_content.css("article.post h2.entry-title a[href]")
             else:
-                articles = soup.find_all("article", class_="post")
+                title_links = tree.css("article.post h2.entry-title a[href]")
 
-            if not articles:
+            if not title_links:
                 print(f"  No articles found - stopping at page {page-1}")
                 break
 
-            page_urls = []
-            for article in articles:
-                title_link = article.find("h2", class_="entry-title").find("a")
-                if title_link and title_link.get("href"):
-                    page_urls.append(title_link["href"])
+            page_urls = [link.attributes["href"] for link in title_links]
 
             all_urls.extend(page_urls)
             print(f"  Found {len(page_urls)} recipes")
 
-            time.sleep(0.3)  # Brief delay
-
         except Exception as e:
             print(f"  Error: {e}")
             continue
@@ -56,4 +73,4 @@ def quick_scrape_afamilyfeast():
 
 # Run the quick version
 if __name__ == "__main__":
-    urls = quick_scrape_afamilyfeast()
+    urls = asyncio.run(quick_scrape_afamilyfeast())
@@ -1,11 +1,15 @@
 import time
 import re
 import json
+import orjson
 import hashlib
+import queue
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
 from playwright.sync_api import sync_playwright
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
+import soupsieve as sv
 
 # --- Configuration ---
 INPUT_FILE = 'afamilyfeast_recipe_urls.txt'
@@ -14,26 +18,64 @@ WEBSITE_NAME = 'afamilyfeast.com'
 DELIVERY_VERSION = 'V1.0'
 MAX_WORKERS = 4 
 DEBUG_SAVE_HTML = False
+LOAD_WAIT_TIMEOUT_MS = 5000
+WRITE_BATCH_SIZE = 32
+PROCESSING_DATE = datetime.now().strftime("%Y-%m-%d")
+BROWSER_POOL_RECYCLE_AFTER = 100
+CHROMIUM_ARGS = [
+    '--no-sandbox', '--disable-gpu', '--disable-dev-shm-usage', '--disable-extensions',
+    '--disable-background-networking', '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-features=Translate,BackForwardCache,MediaRouter',
+    '--mute-audio', '--no-first-run', '--no-zygote',
+]
+
+_EMOJI_RE = re.compile("[" u"\U0001F600-\U0001F64F" u"\U0001F300-\U0001F5FF" u"\U0001F680-\U0001F6FF" u"\U0001F1E0-\U0001F1FF" u"\U00002702-\U000027B0" u"\U000024C2-\U0001F251" "]+", flags=re.UNICODE)
+# Emails before phones, so no address is half-masked
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+\-]+@[A-Za-z0-9.\-]+\.[A-Za-z]{2,7}\b')
+_PHONE_RE = re.compile(r'(\(?\d{3}\)?[\s.-]?)?\d{3}[\s.-]?\d{4}')
+_MULTISPACE_RE = re.compile(r' +')
+_MULTINL_RE = re.compile(r'\n{2,}')
+_PUNCT_TABLE = str.maketrans({'’': "'", '‘': "'", '“': '"', '”': '"', '…': '...', '–': '-', '—': '-'})
+_URL_IN_LINE = re.compile(rb'"url"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+_ARTICLE_SEL = sv.compile('article.post')
+_TITLE_SEL = sv.compile('h1.entry-title')
+_CONTENT_SEL = sv.compile('.entry-content')
+_RECIPE_REMOVE_SEL = sv.compile('.oc-recipe-rating, .oc-recipe-servings, .oc-recipe-details-container, .oc-recipe-buttons, .tasty-recipes-copy-button, .oc-recipe-nutrifox, .oc-recipe-footer, .recipe-before, .recipe-after, .mv-ad-box')
+_REMOVE_SELECTORS = [sv.compile(selector) for selector in [
+    '.site-header', 'footer.site-footer', 'aside.sidebar', '.before-header', '.post-footer',
+    '#respond', '.entry-comments', '.author-box', '.after-entry-additions',
+    '.info-text', '.breadcrumb', '.block-disclosure', '.dpsp-shortcode-wrapper',
+    '.mv-ad-box', '.lwptoc', '[data-testid="inline-subscribe-cta-0"]',
+    '.wp-block-separator', '.wp-block-buttons', '.tasty-recipes-jump-target',
+    '.recipe-after', '.recipe-before', '.featured-content.block-posts',
+    '.featured-content.block-callout', '.featured-content.block-subscribe',
+    '.featured-content.block-bio', '.featured-content.block-social',
+    '.featured-content.block-review', '.schema-faq',
+]]
 
 def clean_text(text: str) -> str:
-    """Applies a series of cleaning and anonymization rules to the text."""
+    """Applies a series of cleaning and anonymization rules to the text.
+
+    >>> clean_text("Reach (555) 123-4567bob@site.org")
+    'Reach (555) xxxxxxxxxxxxxxxxxxxx'
+    >>> clean_text("555 1234567a@b.co")
+    '555 xxxxxxxxxxxxx'
+    """
     if not isinstance(text, str): return ""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
-    text = re.sub(email_pattern, lambda m: 'x' * len(m.group()), text)
-    phone_pattern = r'(\(?\d{3}\)?[\s.-]?)?\d{3}[\s.-]?\d{4}'
-    text = re.sub(phone_pattern, lambda m: 'x' * len(m.group()), text)
-    text = text.replace('’', "'").replace('‘', "'").replace('“', '"').replace('”', '"')
-    text = text.replace('…', '...').replace('–', '-').replace('—', '-')
-    emoji_pattern = re.compile("[" u"\U0001F600-\U0001F64F" u"\U0001F300-\U0001F5FF" u"\U0001F680-\U0001F6FF" u"\U0001F1E0-\U0001F1FF" u"\U00002702-\U000027B0" u"\U000024C2-\U0001F251" "]+", flags=re.UNICODE)
-    text = emoji_pattern.sub(r'', text)
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n{2,}', '\n', text)
+    text = _EMAIL_RE.sub(lambda m: 'x' * len(m.group()), text)
+    text = _PHONE_RE.sub(lambda m: 'x' * len(m.group()), text)
+    text = text.translate(_PUNCT_TABLE)
+    text = _EMOJI_RE.sub(r'', text)
+    text = _MULTISPACE_RE.sub(' ', text)
+    text = _MULTINL_RE.sub('\n', text)
     return text.strip()
 
 def parse_tasty_recipe_card(recipe_container):
     """Parses only the specified parts of a tasty-recipes container."""
     if not recipe_container: return ""
-    for unwanted in recipe_container.select('.oc-recipe-rating, .oc-recipe-servings, .oc-recipe-details-container, .oc-recipe-buttons, .tasty-recipes-copy-button, .oc-recipe-nutrifox, .oc-recipe-footer, .recipe-before, .recipe-after, .mv-ad-box'):
+    for unwanted in _RECIPE_REMOVE_SEL.select(recipe_container):
         unwanted.decompose()
     parts = []
     title_tag = recipe_container.select_one('h2.oc-recipe-title')
@@ -57,36 +99,42 @@ def parse_tasty_recipe_card(recipe_container):
             parts.append(notes_text)
     return '\n'.join(parts)
 
+_NESTED_BLOCK_TAGS = frozenset(['p', 'h2', 'ul', 'ol', 'figure'])
+
+def iter_content_blocks(root):
+    """Yields nested p/h2/ul/ol/figure tags in document order in a single walk.
+
+    tasty-recipes subtrees are never entered (the recipe card is parsed on its own),
+    which replaces a find_parent() ancestor scan for every matched tag.
+    """
+    for child in root.children:
+        if not isinstance(child, Tag) or 'tasty-recipes' in child.get('class', []):
+            continue
+        if child.name in _NESTED_BLOCK_TAGS:
+            yield child
+        yield from iter_content_blocks(child)
+
 def parse_html_content(html: str, url: str) -> dict | None:
     """Parses the full HTML content using a simplified, more robust method."""
-    soup = BeautifulSoup(html, 'html.parser')
+    if '<article' not in html or 'entry-title' not in html:
+        return None
+    soup = BeautifulSoup(html, 'lxml')
 
     # --- Cleanup Logic ---
-    selectors_to_remove = [
-        '.site-header', 'footer.site-footer', 'aside.sidebar', '.before-header', '.post-footer', 
-        '#respond', '.entry-comments', '.author-box', '.after-entry-additions',
-        '.info-text', '.breadcrumb', '.block-disclosure', '.dpsp-shortcode-wrapper', 
-        '.mv-ad-box', '.lwptoc', '[data-testid="inline-subscribe-cta-0"]', 
-        '.wp-block-separator', '.wp-block-buttons', '.tasty-recipes-jump-target', 
-        '.recipe-after', '.recipe-before', '.featured-content.block-posts',      
-        '.featured-content.block-callout', '.featured-content.block-subscribe',
-        '.featured-content.block-bio', '.featured-content.block-social',
-        '.featured-content.block-review', '.schema-faq',
-    ]
-    for selector in selectors_to_remove:
-        for element in soup.select(selector):
+    for selector in _REMOVE_SELECTORS:
+        for element in selector.select(soup):
             element.decompose()
 
-    article_container = soup.select_one('article.post')
+    article_container = _ARTICLE_SEL.select_one(soup)
     if not article_container:
         return None
 
     content_parts = []
-    title_tag = soup.select_one('h1.entry-title')
+    title_tag = _TITLE_SEL.select_one(soup)
     if not title_tag: return None
     title = title_tag.get_text(strip=True)
 
-    content_area = article_container.select_one('.entry-content')
+    content_area = _CONTENT_SEL.select_one(article_container)
     if not content_area:
         return None
 
@@ -106,8 +154,8 @@ def parse_html_content(html: str, url: str) -> dict | None:
                 img_url = img.get('data-lazy-src') or img.get('src')
                 content_parts.append(f"[image: {img_url}]")
         elif element.name == 'div': # Handle content nested inside generic divs
-            for child in element.find_all(['p', 'h2', 'ul', 'ol', 'figure'], recursive=True):
-                if child.find_parent(class_='tasty-recipes'): continue
+            if 'tasty-recipes' in element.get('class', []): continue
+            for child in iter_content_blocks(element):
                 if child.name in ['p', 'h2']:
                     text = child.get_text(strip=True)
                     if text: content_parts.append(text)
@@ -125,50 +173,130 @@ def parse_html_content(html: str, url: str) -> dict | None:
     
     if len(cleaned_content) < 200: return None
     
-    processing_date = datetime.now().strftime("%Y-%m-%d")
-    data = { "ID": hashlib.md5(url.encode('utf-8')).hexdigest(), "Text": f"{cleaned_title}\n{cleaned_content}", "meta": { "data_info": { "lang": "en", "url": url, "source": WEBSITE_NAME, "type": "Article", "processing_date": processing_date, "delivery_version": DELIVERY_VERSION, "title": cleaned_title, "content": cleaned_content, "content_info": { "domain": "daily_life", "subdomain": "Cooking Tips, food knowledge, food preservation" }}}}
+    data = { "ID": hashlib.md5(url.encode('utf-8'), usedforsecurity=False).hexdigest(), "Text": f"{cleaned_title}\n{cleaned_content}", "meta": { "data_info": { "lang": "en", "url": url, "source": WEBSITE_NAME, "type": "Article", "processing_date": PROCESSING_DATE, "delivery_version": DELIVERY_VERSION, "title": cleaned_title, "content": cleaned_content, "content_info": { "domain": "daily_life", "subdomain": "Cooking Tips, food knowledge, food preservation" }}}}
     return data
 
-def scrape_url_task(url: str):
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+BLOCKED_RESOURCE_TYPES = frozenset({"stylesheet", "font", "media", "image", "other"})
+BLOCKED_HOSTS = (
+    "doubleclick.net", "googlesyndication.com", "googletagmanager.com",
+    "google-analytics.com", "googleadservices.com", "facebook.net", "facebook.com",
+    "amazon-adsystem.com", "adthrive.com", "mediavine.com", "pinterest.com", "hotjar.com",
+)
+_BLOCKED_HOST_SUFFIXES = tuple("." + host for host in BLOCKED_HOSTS)
+
+def block_unneeded_requests(route):
+    """Aborts requests for anything but the page HTML."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return route.abort()
+    host = urlparse(request.url).hostname or ""
+    if ("." + host).endswith(_BLOCKED_HOST_SUFFIXES):
+        return route.abort()
+    return route.continue_()
+
+class BrowserPool:
+    """Chromium for a single worker thread, reused across its URLs."""
+
+    def __init__(self, recycle_after: int = BROWSER_POOL_RECYCLE_AFTER):
+        self.recycle_after = recycle_after
+        self.playwright = None
+        self.browser = None
+        self.contexts_served = 0
+
+    def _launch(self):
+        if self.playwright is None:
+            self.playwright = sync_playwright().start()
         try:
-            page.route("**/*", lambda route: route.abort() if route.request.resource_type in {"stylesheet", "font", "media"} else route.continue_())
-            page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            try: page.locator('button:has-text("Accept")').click(timeout=2000)
+            self.browser = self.playwright.chromium.launch(headless=True, args=CHROMIUM_ARGS)
+        except Exception:
+            self.playwright.stop()
+            self.playwright = None
+            raise
+        self.contexts_served = 0
+
+    def acquire(self):
+        if self.browser is None:
+            self._launch()
+        elif self.contexts_served >= self.recycle_after or not self.browser.is_connected():
+            try: self.browser.close()
+            except Exception: pass
+            self.browser = None
+            self._launch()
+        self.contexts_served += 1
+        return self.browser.new_context()
+
+    def release(self, ctx):
+        ctx.close()
+
+    def close(self):
+        if self.browser is not None:
+            try: self.browser.close()
             except Exception: pass
-            for _ in range(3):
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(1)
-            html = page.content()
-            if DEBUG_SAVE_HTML:
-                filename = re.sub(r'[\\/*?:"<>|]', "", url.replace("https://", "").replace("http://", "").replace("/", "_")) + ".html"
-                with open(filename, 'w', encoding='utf-8') as f: f.write(html)
-                print(f"🐛 DEBUG: Saved raw HTML for {url} to '{filename}'")
-            return parse_html_content(html, url)
-        finally:
-            page.close()
-            browser.close()
+            self.browser = None
+        if self.playwright is not None:
+            try: self.playwright.stop()
+            except Exception: pass
+            self.playwright = None
+
+def scrape_url_task(url: str, pool: BrowserPool):
+    ctx = pool.acquire()
+    page = ctx.new_page()
+    try:
+        page.route("**/*", block_unneeded_requests)
+        page.goto(url, wait_until='domcontentloaded', timeout=60000)
+        try: page.locator('button:has-text("Accept")').click(timeout=2000)
+        except Exception: pass
+        page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        try: page.wait_for_function("document.readyState === 'complete'", timeout=LOAD_WAIT_TIMEOUT_MS)
+        except Exception: pass
+        html = page.content()
+        if DEBUG_SAVE_HTML:
+            filename = re.sub(r'[\\/*?:"<>|]', "", url.replace("https://", "").replace("http://", "").replace("/", "_")) + ".html"
+            with open(filename, 'w', encoding='utf-8') as f: f.write(html)
+            print(f"🐛 DEBUG: Saved raw HTML for {url} to '{filename}'")
+        return parse_html_content(html, url)
+    finally:
+        page.close()
+        pool.release(ctx)
+
+def scrape_worker(urls: queue.SimpleQueue, results: queue.SimpleQueue):
+    """Worker loop: scrapes queued URLs until none are left, then closes its browser."""
+    pool = BrowserPool()
+    try:
+        while True:
+            try: url = urls.get_nowait()
+            except queue.Empty: return
+            try: results.put((url, scrape_url_task(url, pool), None))
+            except Exception as exc: results.put((url, None, exc))
+    finally:
+        pool.close()
 
 def main():
     scraped_urls = set()
     try:
-        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f_out:
+        with open(OUTPUT_FILE, 'rb') as f_out:
             for line in f_out:
-                try:
-                    data = json.loads(line)
-                    scraped_urls.add(data['meta']['data_info']['url'])
-                except (json.JSONDecodeError, KeyError):
-                    continue 
+                if not line.rstrip().endswith(b'}'):
+                    continue
+                m = _URL_IN_LINE.search(line)
+                if m:
+                    url = m.group(1)
+                    scraped_urls.add(json.loads(b'"' + url + b'"').encode('utf-8') if b'\\' in url else url)
         print(f"Found {len(scraped_urls)} already scraped URLs. Resuming...")
     except FileNotFoundError:
         print("Output file not found. Starting a new scrape.")
 
     try:
-        with open(INPUT_FILE, 'r', encoding='utf-8') as f_in:
-            all_urls = {line.strip() for line in f_in if line.strip()}
-            urls_to_scrape = list(all_urls - scraped_urls)
+        total_urls = 0
+        pending = {}
+        with open(INPUT_FILE, 'rb') as f_in:
+            for line in f_in:
+                url = line.strip()
+                if url:
+                    total_urls += 1
+                    if url not in scraped_urls:
+                        pending[url] = None
+        urls_to_scrape = [url.decode('utf-8') for url in pending]
     except FileNotFoundError:
         print(f"Error: Input file '{INPUT_FILE}' not found. Please create it.")
         return
@@ -177,25 +305,36 @@ def main():
         print("All URLs from the input file have already been scraped. Nothing to do.")
         return
 
-    print(f"Total URLs in file: {len(all_urls)}. Remaining to scrape: {len(urls_to_scrape)}.")
+    print(f"Total URLs in file: {total_urls}. Remaining to scrape: {len(urls_to_scrape)}.")
     start_time = time.time()
     scraped_count = 0
     
-    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_url = {executor.submit(scrape_url_task, url): url for url in urls_to_scrape}
-        with open(OUTPUT_FILE, 'a', encoding='utf-8') as f_out:
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    article_data = future.result()
-                    if article_data:
-                        f_out.write(json.dumps(article_data, ensure_ascii=False) + '\n')
+    urls = queue.SimpleQueue()
+    for url in urls_to_scrape:
+        urls.put(url)
+    results = queue.SimpleQueue()
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for _ in range(MAX_WORKERS):
+            executor.submit(scrape_worker, urls, results)
+        write_buf = []
+        with open(OUTPUT_FILE, 'ab') as f_out:
+            try:
+                for _ in range(len(urls_to_scrape)):
+                    url, article_data, exc = results.get()
+                    if exc is not None:
+                        print(f"❌ ERROR: {url} generated an exception: {exc}")
+                    elif article_data:
+                        write_buf.append(orjson.dumps(article_data) + b'\n')
+                        if len(write_buf) >= WRITE_BATCH_SIZE:
+                            f_out.write(b''.join(write_buf))
+                            write_buf.clear()
+                            f_out.flush()
                         scraped_count += 1
                         print(f"✅ SUCCESS: Scraped {url}")
                     else:
                         print(f"⏭️ SKIPPED: {url} (No data or content too short after cleaning)")
-                except Exception as exc:
-                    print(f"❌ ERROR: {url} generated an exception: {exc}")
+            finally:
+                f_out.write(b''.join(write_buf))
 
     end_time = time.time()
     total_time = end_time - start_time
@@ -1,10 +1,11 @@
-import requests
-from bs4 import BeautifulSoup
+import httpx
+from selectolax.lexbor import LexborHTMLParser
 import time
 import os
 import concurrent.futures
 from urllib.parse import urljoin
 import logging
+import re
 
 # Set up logging
 logging.basicConfig(
@@ -12,54 +13,127 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Page number in WordPress pagination links, e.g. .../category/x/page/7/
+PAGE_NUM_RE = re.compile(r"/page/(\d+)/?")
+# Classes of the pagination's next/prev arrows, as opposed to numbered page links
+PAGER_STEP_CLASSES = {"next", "prev", "previouspostslink", "nextpostslink"}
+
 
 class FastScraper:
     def __init__(self, max_workers=5):
-        self.session = requests.Session()
-        self.session.headers.update(
-            {
+        # One HTTP/2 client shared by all worker threads: a category's pages share an
+        # origin, so the parallel GETs multiplex over a single TCP+TLS connection
+        # (needs the h2 extra: pip install "httpx[http2]")
+        self.client = httpx.Client(
+            http2=True,
+            headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-            }
+            },
+            timeout=10.0,
+            # httpx does not follow redirects by default; requests did
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
         )
         self.max_workers = max_workers
 
-    def scrape_page(self, url):
-        """Scrape a single page and return links"""
+    def request_page(self, url):
+        """Like fetch_page, but request and parse errors propagate to the caller"""
+        response = self.client.get(url)
+        # WordPress answers 404 past a category's last page: that is an empty page,
+        # not a failed fetch
+        if response.status_code == 404:
+            return [], False, None
+        response.raise_for_status()
+
+        # Only a couple of selector lookups are needed, so a C-level selectolax parse
+        # beats building a full BeautifulSoup tree
+        tree = LexborHTMLParser(response.content)
+        links = [
+            href
+            for a in tree.css("article.entry h2.entry-title a[href]")
+            if (href := a.attributes.get("href"))
+        ]
+
+        # Highest numbered page linked from the pagination, if the theme shows one;
+        # next/prev links only ever point one page away, so they are skipped
+        page_numbers = [
+            int(m.group(1))
+            for a in tree.css(".wp-pagenavi a[href], .pagination a[href], a.page-numbers[href]")
+            if not PAGER_STEP_CLASSES.intersection((a.attributes.get("class") or "").split())
+            and a.attributes.get("rel") not in ("next", "prev")
+            and (m := PAGE_NUM_RE.search(a.attributes.get("href") or ""))
+        ]
+
+        return links, tree.css_first("a.next") is not None, max(page_numbers, default=None)
+
+    def fetch_page(self, url):
+        """Scrape a single page and return (links, has_next, last_page_number)"""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            articles = soup.find_all("article", class_="entry")
-
-            links = []
-            for article in articles:
-                title_element = article.find("h2", class_="entry-title")
-                if title_element:
-                    title_link = title_element.find("a")
-                    if title_link and title_link.get("href"):
-                        links.append(title_link["href"])
-
-            return links, soup.find("a", class_="next") is not None
-
+            return self.request_page(url)
         except Exception as e:
             logger.warning(f"Error scraping {url}: {e}")
-            return [], False
-
-    def generate_page_urls(self, category_url, max_pages=10):
-        """Generate all page URLs for a category"""
-        urls = [category_url.rstrip("/")]
-
-        # Generate subsequent page URLs
-        for page_num in range(2, max_pages + 1):
-            urls.append(f"{category_url.rstrip('/')}/page/{page_num}/")
+            return [], False, None
 
-        return urls
-
-    def scrape_category_parallel(self, category_url, output_file, max_pages=10):
+    def scrape_page(self, url):
+        """Scrape a single page and return links"""
+        links, has_next, _ = self.fetch_page(url)
+        return links, has_next
+
+    def page_url(self, category_url, page_num):
+        # Trailing slash on page 1 too, matching WordPress's canonical URL (no redirect hop)
+        if page_num == 1:
+            return f"{category_url.rstrip('/')}/"
+        return f"{category_url.rstrip('/')}/page/{page_num}/"
+
+    def probe_last_page(self, category_url, probed, max_pages=50):
+        """Double the page number (never past max_pages) until a page comes back empty;
+        fills probed with the links of every page fetched and returns an upper bound on
+        the last page"""
+        page_num = 2
+        retried = False
+        while not max_pages or page_num <= max_pages:
+            try:
+                links, _, _ = self.request_page(self.page_url(category_url, page_num))
+            except Exception as e:
+                # A failed fetch says nothing about where the category ends: try the page
+                # once more, then keep it in range for the parallel pass and stop probing
+                logger.warning(f"Error probing {category_url} page {page_num}: {e}")
+                if retried:
+                    return page_num
+                retried = True
+                continue
+            retried = False
+            probed[page_num] = links
+            if not links:
+                return page_num - 1
+            if page_num == max_pages:
+                return page_num
+            page_num = min(page_num * 2, max_pages) if max_pages else page_num * 2
+        return max_pages
+
+    def scrape_category_parallel(self, category_url, output_file, max_pages=50):
         """Scrape a category using parallel requests"""
-        urls = self.generate_page_urls(category_url, max_pages)
-        all_links = []
+        # Fetch page 1 first so exactly the category's real pages are requested in
+        # parallel, instead of a fixed max_pages range
+        all_links, _, last_page = self.fetch_page(self.page_url(category_url, 1))
+        logger.info(f"Scraped {category_url}: found {len(all_links)} links")
+
+        # Numbered links up to 2 don't show where a longer category ends (and some
+        # themes show none), so the page count is probed instead
+        probed = {}
+        if last_page is None or last_page <= 2:
+            last_page = self.probe_last_page(category_url, probed, max_pages)
+        if max_pages:
+            last_page = min(last_page, max_pages)
+
+        for page_num, links in probed.items():
+            if page_num <= last_page:
+                all_links.extend(links)
+        urls = [
+            self.page_url(category_url, page_num)
+            for page_num in range(2, last_page + 1)
+            if page_num not in probed
+        ]
 
         # Scrape pages in parallel
         with concurrent.futures.ThreadPoolExecutor(
@@ -92,10 +166,7 @@ class FastScraper:
         total_links = 0
 
         while page_num <= max_pages:
-            if page_num == 1:
-                url = category_url.rstrip("/")
-            else:
-                url = f"{category_url.rstrip('/')}/page/{page_num}/"
+            url = self.page_url(category_url, page_num)
 
             logger.info(f"Scraping page {page_num}: {url}")
 
@@ -183,6 +254,7 @@ def scrape_all_categories_parallel():
             except Exception as e:
                 logger.error(f"Failed to scrape category {category}: {e}")
 
+    scraper.client.close()
     generate_final_summary(output_file)
 
 
@@ -215,6 +287,7 @@ def scrape_all_categories_fast_sequential():
         if i < len(categories):
             time.sleep(1)  # Reduced from 3 seconds
 
+    scraper.client.close()
     generate_final_summary(output_file)
 
 
@@ -225,18 +298,21 @@ def generate_final_summary(output_file):
     logger.info("=" * 50)
 
     if os.path.exists(output_file):
-        with open(output_file, "r", encoding="utf-8") as f:
-            all_links = f.readlines()
-            unique_links = set(all_links)
-
-        logger.info(f"Total links collected: {len(all_links)}")
-        logger.info(f"Unique links: {len(unique_links)}")
-        logger.info(f"Links saved to: {output_file}")
-
-        # Save unique links
+        # Dedupe in one streaming pass, writing each link the first time it is seen,
+        # so only the set of unique lines is held in memory
         unique_file = "unique_articles_links.txt"
-        with open(unique_file, "w", encoding="utf-8") as f:
-            f.writelines(sorted(unique_links))
+        total_links = 0
+        seen = set()
+        with open(output_file, "rb") as fin, open(unique_file, "wb") as fout:
+            for line in fin:
+                total_links += 1
+                if line not in seen:
+                    seen.add(line)
+                    fout.write(line)
+
+        logger.info(f"Total links collected: {total_links}")
+        logger.info(f"Unique links: {len(seen)}")
+        logger.info(f"Links saved to: {output_file}")
         logger.info(f"Unique links also saved to: {unique_file}")
     else:
         logger.warning("No links were collected.")
@@ -1,100 +1,151 @@
 import time
 import re
-import json
+import orjson
+import asyncio
 import hashlib
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from playwright.sync_api import sync_playwright
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup
+import soupsieve as sv
+try:
+    import re2 as pii_re # linear-time matching for the PII patterns
+except ImportError:
+    pii_re = re
 
 # --- Configuration ---
 INPUT_FILE = 'all_articles_links.txt'
 OUTPUT_FILE = 'output.jsonl'
 WEBSITE_NAME = 'africanbites.com'
 DELIVERY_VERSION = 'V1.0'
-MAX_WORKERS = 4
+MAX_PARALLEL_PAGES = 8 # Pages open at once in the single shared browser
+PARSE_WORKERS = 2 # Threads for BeautifulSoup parsing, off the event loop
+WRITE_BATCH_SIZE = 64 # Articles per batched write
 DEBUG_SAVE_HTML = False
 
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001F600-\U0001F64F"  # emoticons
+    "\U0001F300-\U0001F5FF"  # symbols & pictographs
+    "\U0001F680-\U0001F6FF"  # transport & map symbols
+    "\U0001F1E0-\U0001F1FF"  # flags (iOS)
+    "\U0001F900-\U0001F9FF"  # Supplemental Symbols and Pictographs (NEW)
+    "\U0001FA70-\U0001FAFF"  # Symbols and Pictographs Extended-A (NEW - Catches 🫵)
+    "\U00002702-\U000027B0"  # Dingbats
+    "\U000024C2-\U0001F251" 
+    "\U0000FE00-\U0000FE0F"  # Variation Selectors
+    "\U000020D0-\U000020FF"
+    "]+", flags=re.UNICODE
+)
+_MULTI_SPACE_RE = re.compile(r' +')
+_MULTI_NL_RE = re.compile(r'\n{2,}')
+# Explicit classes only (no \b, \d, \s) so re and re2 mask the same text
+_EMAIL_RE = pii_re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,7}')
+_PHONE_RE = pii_re.compile(r'(\(?[0-9]{3}\)?[ \t\r\n\f\v\xa0.-]?)?[0-9]{3}[ \t\r\n\f\v\xa0.-]?[0-9]{4}')
+_PUNCT_TABLE = str.maketrans({'’': "'", '‘': "'", '“': '"', '”': '"', '…': '...', '–': '-', '—': '-'})
+
+_ARTICLE_SEL = sv.compile('article.single-entry')
+_TITLE_SEL = sv.compile('h1.entry-title')
+_CONTENT_SEL = sv.compile('.entry-content')
+_CONTENT_BLOCKS_SEL = sv.compile('p, h2, h3, ol, ul, figure.wp-block-image, div[id*="wprm-recipe-container-"]')
+# All junk selectors in one, for a single traversal
+_REMOVE_SEL = sv.compile(', '.join([
+    '#kadence-breadcrumbs',
+    '.entry-meta',
+    'div#dpsp-content-top',
+    '.wprm-recipe-snippet',
+    '#savetherecipe',
+    '.mv-ad-box',
+    'h2#more-recipes',
+    'h2#more-recipes + ol, h2#more-recipes + p + ul',
+    '.navigation.post-navigation',
+    '.entry-related',
+    '#comments',
+    '.wprm-nutrition-label-shortcode-container',
+    '.lwptoc_i'
+]))
+_WPRM_REMOVE_SEL = sv.compile('.wprm-social, .socialShare, .wprm-recipe-user-rating, .wprm-entry-info, .wprm-entry-footer, .wprm-entry-nutrition, .wprm-recipe-print, .wprm-call-to-action, .wprm-unit-conversion-container')
+_WPRM_NAME_SEL = sv.compile('h2.wprm-recipe-name')
+_WPRM_INGREDIENTS_SEL = sv.compile('.wprm-recipe-ingredients-container')
+_WPRM_INGREDIENT_GROUP_SEL = sv.compile('.wprm-recipe-ingredient-group')
+_WPRM_INGREDIENT_GROUP_NAME_SEL = sv.compile('.wprm-recipe-ingredient-group-name')
+_WPRM_INGREDIENT_SEL = sv.compile('.wprm-recipe-ingredient')
+_WPRM_INSTRUCTIONS_SEL = sv.compile('.wprm-recipe-instructions-container')
+_WPRM_INSTRUCTION_GROUP_SEL = sv.compile('.wprm-recipe-instruction-group')
+_WPRM_INSTRUCTION_GROUP_NAME_SEL = sv.compile('.wprm-recipe-instruction-group-name')
+_WPRM_INSTRUCTION_SEL = sv.compile('.wprm-recipe-instruction')
+_WPRM_NOTES_SEL = sv.compile('.wprm-recipe-notes-container')
+_WPRM_NOTE_ITEMS_SEL = sv.compile('ol > li, ul > li')
+
 # --- Text Cleaning Functions ---
 
 def normalize_text(text: str) -> str:
     """Handles basic text normalization for punctuation, emojis, and whitespace."""
     if not isinstance(text, str): return ""
     
-    text = text.replace('’', "'").replace('‘', "'").replace('“', '"').replace('”', '"')
-    text = text.replace('…', '...').replace('–', '-').replace('—', '-')
-
-    # --- EMOJI FILTER UPDATED ---
-    # Expanded pattern to include newer Unicode emoji blocks
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F"  # emoticons
-        "\U0001F300-\U0001F5FF"  # symbols & pictographs
-        "\U0001F680-\U0001F6FF"  # transport & map symbols
-        "\U0001F1E0-\U0001F1FF"  # flags (iOS)
-        "\U0001F900-\U0001F9FF"  # Supplemental Symbols and Pictographs (NEW)
-        "\U0001FA70-\U0001FAFF"  # Symbols and Pictographs Extended-A (NEW - Catches 🫵)
-        "\U00002702-\U000027B0"  # Dingbats
-        "\U000024C2-\U0001F251" 
-        "\U0000FE00-\U0000FE0F"  # Variation Selectors
-        "\U000020D0-\U000020FF"
-        "]+", flags=re.UNICODE
-    )
-    text = emoji_pattern.sub(r'', text)
-
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n{2,}', '\n', text)
+    # Both passes only touch non-ASCII characters
+    if not text.isascii():
+        text = text.translate(_PUNCT_TABLE)
+        text = _EMOJI_RE.sub(r'', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
+    text = _MULTI_NL_RE.sub('\n', text)
     
     return text.strip()
 
 def anonymize_text(text: str) -> str:
-    """Anonymizes PII like emails and phone numbers."""
+    """Anonymizes PII like emails and phone numbers.
+
+    >>> anonymize_text("Call (555)\\xa0123\\xa04567")
+    'Call xxxxxxxxxxxxxx'
+    >>> anonymize_text("555 123\\n4567")
+    'xxxxxxxxxxxx'
+    """
     if not isinstance(text, str): return ""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
-    text = re.sub(email_pattern, lambda m: 'x' * len(m.group()), text)
-    phone_pattern = r'(\(?\d{3}\)?[\s.-]?)?\d{3}[\s.-]?\d{4}'
-    text = re.sub(phone_pattern, lambda m: 'x' * len(m.group()), text)
+    if '@' in text: # No address possible otherwise
+        text = _EMAIL_RE.sub(lambda m: 'x' * len(m.group()), text)
+    text = _PHONE_RE.sub(lambda m: 'x' * len(m.group()), text)
     return text
 
 def parse_wprm_recipe_card(recipe_container):
     """Parses only the specified parts of a WPRM recipe container."""
     if not recipe_container:
         return ""
-    for unwanted in recipe_container.select('.wprm-social, .socialShare, .wprm-recipe-user-rating, .wprm-entry-info, .wprm-entry-footer, .wprm-entry-nutrition, .wprm-recipe-print, .wprm-call-to-action, .wprm-unit-conversion-container'):
+    for unwanted in _WPRM_REMOVE_SEL.select(recipe_container):
         unwanted.decompose()
 
     parts = []
-    title_tag = recipe_container.select_one('h2.wprm-recipe-name')
+    title_tag = _WPRM_NAME_SEL.select_one(recipe_container)
     if title_tag:
         parts.append(title_tag.get_text(strip=True).upper())
 
-    ingredients_container = recipe_container.select_one('.wprm-recipe-ingredients-container')
+    ingredients_container = _WPRM_INGREDIENTS_SEL.select_one(recipe_container)
     if ingredients_container:
         parts.append("\nIngredients")
-        for group in ingredients_container.select('.wprm-recipe-ingredient-group'):
-            group_title = group.select_one('.wprm-recipe-ingredient-group-name')
+        for group in _WPRM_INGREDIENT_GROUP_SEL.select(ingredients_container):
+            group_title = _WPRM_INGREDIENT_GROUP_NAME_SEL.select_one(group)
             if group_title:
                 parts.append(f"\n{group_title.get_text(strip=True)}")
-            for item in group.select('.wprm-recipe-ingredient'):
+            for item in _WPRM_INGREDIENT_SEL.select(group):
                 ingredient_text = ' '.join(item.stripped_strings).replace('▢', '').strip()
                 if ingredient_text:
                     parts.append(ingredient_text)
 
-    instructions_container = recipe_container.select_one('.wprm-recipe-instructions-container')
+    instructions_container = _WPRM_INSTRUCTIONS_SEL.select_one(recipe_container)
     if instructions_container:
         parts.append("\nInstructions")
-        for group in instructions_container.select('.wprm-recipe-instruction-group'):
-            group_title = group.select_one('.wprm-recipe-instruction-group-name')
+        for group in _WPRM_INSTRUCTION_GROUP_SEL.select(instructions_container):
+            group_title = _WPRM_INSTRUCTION_GROUP_NAME_SEL.select_one(group)
             if group_title:
                 parts.append(f"\n{group_title.get_text(strip=True)}")
-            for i, instruction in enumerate(group.select('.wprm-recipe-instruction'), 1):
+            for i, instruction in enumerate(_WPRM_INSTRUCTION_SEL.select(group), 1):
                 instruction_text = instruction.get_text(strip=True)
                 if instruction_text:
                     parts.append(f"{i}. {instruction_text}")
 
-    notes_container = recipe_container.select_one('.wprm-recipe-notes-container')
+    notes_container = _WPRM_NOTES_SEL.select_one(recipe_container)
     if notes_container:
-        notes_list = [li.get_text(strip=True) for li in notes_container.select('ol > li, ul > li')]
+        notes_list = [li.get_text(strip=True) for li in _WPRM_NOTE_ITEMS_SEL.select(notes_container)]
         if notes_list:
             parts.append("\nNotes:")
             parts.extend(notes_list)
@@ -104,42 +155,24 @@ def parse_wprm_recipe_card(recipe_container):
 
 def parse_html_content(html: str, url: str) -> dict | None:
     """Parses the full HTML content using BeautifulSoup."""
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = BeautifulSoup(html, 'lxml')
     
-    article_container = soup.select_one('article.single-entry')
+    article_container = _ARTICLE_SEL.select_one(soup)
     if not article_container:
         return None
 
-    selectors_to_remove = [
-        '#kadence-breadcrumbs', 
-        '.entry-meta', 
-        'div#dpsp-content-top', 
-        '.wprm-recipe-snippet',
-        '#savetherecipe', 
-        '.mv-ad-box', 
-        'h2#more-recipes', 
-        'h2#more-recipes + ol, h2#more-recipes + p + ul',
-        '.navigation.post-navigation', 
-        '.entry-related', 
-        '#comments', 
-        '.wprm-nutrition-label-shortcode-container',
-        '.lwptoc_i'
-    ]
-    for selector in selectors_to_remove:
-        for element in article_container.select(selector):
-            element.decompose()
+    for element in _REMOVE_SEL.select(article_container):
+        element.decompose()
 
     content_parts = []
-    title_tag = article_container.select_one('h1.entry-title')
+    title_tag = _TITLE_SEL.select_one(article_container)
     if not title_tag: return None
     title = title_tag.get_text(strip=True)
 
-    content_area = article_container.select_one('.entry-content')
+    content_area = _CONTENT_SEL.select_one(article_container)
     if not content_area: return None
 
-    selector_string = 'p, h2, h3, ol, ul, figure.wp-block-image, div[id*="wprm-recipe-container-"]'
-    
-    for element in content_area.select(selector_string, recursive=True):
+    for element in _CONTENT_BLOCKS_SEL.select(content_area):
         if not hasattr(element, 'get'):
             continue
 
@@ -171,38 +204,91 @@ def parse_html_content(html: str, url: str) -> dict | None:
     if len(cleaned_content) < 200: return None
     
     processing_date = datetime.now().strftime("%Y-%m-%d")
-    data = {"ID": hashlib.md5(url.encode('utf-8')).hexdigest(), "Text": f"{normalized_title}\n{cleaned_content}", "meta": {"data_info": {"lang": "en", "url": url, "source": WEBSITE_NAME, "type": "Blog", "processing_date": processing_date, "delivery_version": DELIVERY_VERSION, "title": normalized_title, "content": cleaned_content, "content_info": {"domain": "daily_life", "subdomain": "Cooking Tips, food knowledge, food preservation"}}}}
+    data = {"ID": hashlib.md5(url.encode('utf-8'), usedforsecurity=False).hexdigest(), "Text": f"{normalized_title}\n{cleaned_content}", "meta": {"data_info": {"lang": "en", "url": url, "source": WEBSITE_NAME, "type": "Blog", "processing_date": processing_date, "delivery_version": DELIVERY_VERSION, "title": normalized_title, "content": cleaned_content, "content_info": {"domain": "daily_life", "subdomain": "Cooking Tips, food knowledge, food preservation"}}}}
     return data
 
-def scrape_url_task(url: str):
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+# Only the HTML is needed; image URLs are read from the markup
+BLOCKED_RESOURCE_TYPES = frozenset({"stylesheet", "font", "media", "image", "other"})
+BLOCKED_HOSTS = (
+    "doubleclick.net", "googlesyndication.com", "googletagmanager.com",
+    "google-analytics.com", "googleadservices.com", "facebook.net", "facebook.com",
+    "amazon-adsystem.com", "adthrive.com", "mediavine.com", "taboola.com", "outbrain.com",
+    "pinterest.com", "hotjar.com",
+)
+_BLOCKED_HOST_SUFFIXES = tuple("." + host for host in BLOCKED_HOSTS)
+
+async def block_unneeded_requests(route):
+    """Route handler: aborts heavy resources and ad/analytics hosts."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return await route.abort()
+    host = urlparse(request.url).hostname or ""
+    if ("." + host).endswith(_BLOCKED_HOST_SUFFIXES):
+        return await route.abort()
+    return await route.continue_()
+
+async def scrape_url_task(browser, sem: asyncio.Semaphore, parse_pool: ThreadPoolExecutor, url: str):
+    # Fresh context per URL on the shared browser
+    async with sem:
+        ctx = await browser.new_context()
         try:
-            page.route("**/*", lambda route: route.abort() if route.request.resource_type in {"stylesheet", "font", "media"} else route.continue_())
-            page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            for _ in range(3):
-                page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(0.5)
-            html = page.content()
-            if DEBUG_SAVE_HTML:
-                filename = re.sub(r'[\\/*?:"<>|]', "", url.replace("https://", "").replace("http://", "").replace("/", "_")) + ".html"
-                with open(filename, 'w', encoding='utf-8') as f: f.write(html)
-                print(f"🐛 DEBUG: Saved raw HTML for {url} to '{filename}'")
-            return parse_html_content(html, url)
+            page = await ctx.new_page()
+            await page.route("**/*", block_unneeded_requests)
+            await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+            html = await page.content()
         finally:
-            page.close()
-            browser.close()
+            await ctx.close()
+    if DEBUG_SAVE_HTML:
+        filename = re.sub(r'[\\/*?:"<>|]', "", url.replace("https://", "").replace("http://", "").replace("/", "_")) + ".html"
+        with open(filename, 'w', encoding='utf-8') as f: f.write(html)
+        print(f"🐛 DEBUG: Saved raw HTML for {url} to '{filename}'")
+    # Parse off the event loop
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(parse_pool, parse_html_content, html, url)
+
+async def run_all(urls_to_scrape: list, f_out) -> int:
+    """Scrapes every URL through one browser, writing results as they complete."""
+    scraped_count = 0
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        sem = asyncio.Semaphore(MAX_PARALLEL_PAGES)
+        with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as parse_pool:
+            async def run_one(url):
+                try:
+                    return url, await scrape_url_task(browser, sem, parse_pool, url), None
+                except Exception as exc:
+                    return url, None, exc
+
+            write_buf = []
+            try:
+                for next_done in asyncio.as_completed([run_one(url) for url in urls_to_scrape]):
+                    url, article_data, exc = await next_done
+                    if exc is not None:
+                        print(f"❌ ERROR: {url} generated an exception: {exc}")
+                    elif article_data:
+                        write_buf.append(orjson.dumps(article_data) + b'\n')
+                        if len(write_buf) >= WRITE_BATCH_SIZE:
+                            f_out.write(b''.join(write_buf))
+                            write_buf.clear()
+                            f_out.flush()
+                        scraped_count += 1
+                        print(f"✅ SUCCESS: Scraped {url}")
+                    else:
+                        print(f"⏭️ SKIPPED: {url} (No data or content too short after cleaning)")
+            finally:
+                f_out.write(b''.join(write_buf))
+        await browser.close()
+    return scraped_count
 
 def main():
     scraped_urls = set()
     try:
-        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f_out:
+        with open(OUTPUT_FILE, 'rb') as f_out:
             for line in f_out:
                 try:
-                    data = json.loads(line)
+                    data = orjson.loads(line)
                     scraped_urls.add(data['meta']['data_info']['url'])
-                except (json.JSONDecodeError, KeyError): continue
+                except (orjson.JSONDecodeError, KeyError): continue
         print(f"Found {len(scraped_urls)} already scraped URLs. Resuming...")
     except FileNotFoundError:
         print("Output file not found. Starting a new scrape.")
@@ -221,22 +307,8 @@ def main():
 
     print(f"Total URLs in file: {len(all_urls)}. Remaining to scrape: {len(urls_to_scrape)}.")
     start_time = time.time()
-    scraped_count = 0
-    with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-        future_to_url = {executor.submit(scrape_url_task, url): url for url in urls_to_scrape}
-        with open(OUTPUT_FILE, 'a', encoding='utf-8') as f_out:
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    article_data = future.result()
-                    if article_data:
-                        f_out.write(json.dumps(article_data, ensure_ascii=False) + '\n')
-                        scraped_count += 1
-                        print(f"✅ SUCCESS: Scraped {url}")
-                    else:
-                        print(f"⏭️ SKIPPED: {url} (No data or content too short after cleaning)")
-                except Exception as exc:
-                    print(f"❌ ERROR: {url} generated an exception: {exc}")
+    with open(OUTPUT_FILE, 'ab') as f_out:
+        scraped_count = asyncio.run(run_all(urls_to_scrape, f_out))
     end_time = time.time()
     total_time = end_time - start_time
     print("\n--- Scraping Complete ---")
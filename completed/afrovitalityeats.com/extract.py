@@ -1,4 +1,10 @@
-from bs4 import BeautifulSoup
+from lxml import etree
+
+# Method B target: the first gb-block-post-grid-title heading inside an article
+TITLE_SECTION_LINKS = etree.XPath(
+    "(.//h4[contains(concat(' ', normalize-space(@class), ' '), ' gb-block-post-grid-title ')])[1]//a/@href"
+)
+ARTICLE_LINKS = etree.XPath(".//a/@href")
 
 
 def extract_all_article_links_robust(file_path):
@@ -6,43 +12,30 @@ def extract_all_article_links_robust(file_path):
     Extract all article links using multiple methods for reliability
     """
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            html_content = file.read()
-
-        soup = BeautifulSoup(html_content, "html.parser")
-        article_links = []
+        seen = set()
+        unique_links = []
 
-        # Method 1: Find all article elements and extract links
-        articles = soup.find_all("article")
+        # Method 1: Stream the file and handle each article element as soon as it is parsed,
+        # so memory stays flat no matter how large the saved page is
+        articles = etree.iterparse(file_path, html=True, tag="article", encoding="utf-8")
 
-        for article in articles:
+        for _, article in articles:
             # Try multiple ways to find the article link
 
             # Method A: Look for links in the title section that are not category links
-            title_links = article.find_all("a", href=True)
-            for link in title_links:
-                href = link["href"]
-                if "/category/" not in href and href not in article_links:
-                    article_links.append(href)
+            # Method B: Look for specific structure with gb-block-post-grid-title
+            for candidate_links in (ARTICLE_LINKS(article), TITLE_SECTION_LINKS(article)):
+                for href in candidate_links:
+                    if "/category/" in href or href in seen:
+                        continue
+                    seen.add(href)
+                    unique_links.append(href)
                     break
 
-            # Method B: Look for specific structure with gb-block-post-grid-title
-            title_section = article.find("h4", class_="gb-block-post-grid-title")
-            if title_section:
-                links = title_section.find_all("a", href=True)
-                for link in links:
-                    href = link["href"]
-                    if "/category/" not in href and href not in article_links:
-                        article_links.append(href)
-                        break
-
-        # Remove duplicates while preserving order
-        seen = set()
-        unique_links = []
-        for link in article_links:
-            if link not in seen:
-                seen.add(link)
-                unique_links.append(link)
+            # Free the processed article and any siblings already handled
+            article.clear()
+            while article.getprevious() is not None:
+                del article.getparent()[0]
 
         return unique_links
 
@@ -1,18 +1,89 @@
 import time
 import re
-import json
+import orjson
+import asyncio
 import hashlib
 from datetime import datetime
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from playwright.sync_api import sync_playwright
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+from playwright.async_api import async_playwright
 from bs4 import BeautifulSoup, Tag
+import soupsieve as sv
+try:
+    import re2 as pii_re
+except ImportError:
+    pii_re = re
 
 # --- Configuration ---
 INPUT_FILE = 'all_article_links.txt' # Make sure this file contains URLs from afrovitalityeats.com
 OUTPUT_FILE = 'output.jsonl'
 WEBSITE_NAME = 'afrovitalityeats.com'
 DELIVERY_VERSION = 'V1.0'
-MAX_WORKERS = 4
+MAX_PARALLEL_PAGES = 8
+PARSE_WORKERS = 2
+WRITE_BATCH_SIZE = 64
+
+_EMOJI_RE = re.compile(
+    "["
+    "\U0001F600-\U0001F64F" # emoticons
+    "\U0001F300-\U0001F5FF" # symbols & pictographs
+    "\U0001F680-\U0001F6FF" # transport & map symbols
+    "\U0001F1E0-\U0001F1FF" # flags (iOS)
+    "\U0001F900-\U0001F9FF" # Supplemental Symbols and Pictographs
+    "\U0001FA70-\U0001FAFF" # Symbols and Pictographs Extended-A
+    "\U00002702-\U000027B0" # Dingbats
+    "\U000024C2-\U0001F251"
+    "\U0000FE00-\U0000FE0F" # Variation Selectors
+    "\U000020D0-\U000020FF"
+    "]+", flags=re.UNICODE
+)
+_MULTI_SPACE_RE = re.compile(r' +')
+_MULTI_NL_RE = re.compile(r'\n{2,}')
+_WHITESPACE_RE = re.compile(r'\s+')
+# No \b, \d or \s: re and re2 read those differently
+_EMAIL_RE = pii_re.compile(r'[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,7}')
+_PHONE_RE = pii_re.compile(r'(\(?[0-9]{3}\)?[ \t\r\n\f\v\xa0.-]?)?[0-9]{3}[ \t\r\n\f\v\xa0.-]?[0-9]{4}')
+_IMAGE_TAG_RE = re.compile(r'(\[image: [^\]]+\])')
+_IMG_PLACEHOLDER = '___IMG_TAG_PLACEHOLDER___'
+_IMG_PLACEHOLDER_RE = re.compile(_IMG_PLACEHOLDER)
+_PUNCT_TABLE = str.maketrans({'’': "'", '‘': "'", '“': '"', '”': '"', '…': '...', '–': '-', '—': '-'})
+
+_ARTICLE_SEL = sv.compile('article.entry')
+_TITLE_SEL = sv.compile('h1.entry-title')
+_GARDEN_CATEGORY_SEL = sv.compile('p.entry-meta .entry-categories a[href*="/backyard-garden/"]')
+_CONTENT_SEL = sv.compile('.entry-content')
+_RECIPE_CARD_SEL = sv.compile('div[id*="wprm-recipe-container-"]')
+_REMOVE_SEL = sv.compile(', '.join([
+    '.entry-meta', '.share-before', '.share-after', '.google-auto-placed',
+    '.ap_container', 'ins.adsbygoogle', '.jp-relatedposts', '.wprm-recipe-snippet',
+]))
+_WPRM_REMOVE_SEL = sv.compile(', '.join([
+    '.wprm-template-chic-buttons','.wprm-recipe-buttons','.wprm-recipe-print',
+    '.wprm-recipe-pin','.wprm-recipe-jump','.wprm-recipe-adjustable-servings-container',
+    '.wprm-recipe-shop-instacart','.wprm-icon-shortcode','h3.wprm-recipe-nutrition-header',
+    '.wprm-nutrition-label-container','.wprm-recipe-keyword-container',
+    '.wprm-call-to-action','.wprm-recipe-user-rating','.wprm-entry-info','.wprm-entry-footer',
+]))
+_WPRM_NAME_SEL = sv.compile('h2.wprm-recipe-name')
+_WPRM_SUMMARY_SEL = sv.compile('.wprm-recipe-summary')
+_WPRM_PREP_TIME_SEL = sv.compile('.wprm-recipe-prep-time-container .wprm-recipe-time')
+_WPRM_COOK_TIME_SEL = sv.compile('.wprm-recipe-cook-time-container .wprm-recipe-time')
+_WPRM_GROUP_NAME_SEL = sv.compile('h4.wprm-recipe-group-name')
+_WPRM_INGREDIENTS_SEL = sv.compile('.wprm-recipe-ingredients-container')
+_WPRM_INGREDIENTS_HEADER_SEL = sv.compile('h3.wprm-recipe-ingredients-header')
+_WPRM_INGREDIENT_GROUP_SEL = sv.compile('.wprm-recipe-ingredient-group')
+_WPRM_INGREDIENT_SEL = sv.compile('li.wprm-recipe-ingredient')
+_WPRM_AMOUNT_SEL = sv.compile('.wprm-recipe-ingredient-amount')
+_WPRM_UNIT_SEL = sv.compile('.wprm-recipe-ingredient-unit')
+_WPRM_INGREDIENT_NAME_SEL = sv.compile('.wprm-recipe-ingredient-name')
+_WPRM_INGREDIENT_NOTES_SEL = sv.compile('.wprm-recipe-ingredient-notes')
+_WPRM_INSTRUCTIONS_SEL = sv.compile('.wprm-recipe-instructions-container')
+_WPRM_INSTRUCTIONS_HEADER_SEL = sv.compile('h3.wprm-recipe-instructions-header')
+_WPRM_INSTRUCTION_GROUP_SEL = sv.compile('.wprm-recipe-instruction-group')
+_WPRM_INSTRUCTION_LIST_SEL = sv.compile('ul.wprm-recipe-instructions, ol.wprm-recipe-instructions')
+_WPRM_NOTES_SEL = sv.compile('.wprm-recipe-notes-container')
+_WPRM_NOTES_HEADER_SEL = sv.compile('h3.wprm-recipe-notes-header')
+_WPRM_NOTES_CONTENT_SEL = sv.compile('.wprm-recipe-notes')
 
 # --- Text Cleaning Functions ---
 
@@ -20,48 +91,36 @@ def normalize_text(text: str) -> str:
     """Handles basic text normalization for punctuation, emojis, and whitespace structuring."""
     if not isinstance(text, str): return ""
 
-    text = text.replace('’', "'").replace('‘', "'").replace('“', '"').replace('”', '"')
-    text = text.replace('…', '...').replace('–', '-').replace('—', '-')
-
-    emoji_pattern = re.compile(
-        "["
-        "\U0001F600-\U0001F64F" # emoticons
-        "\U0001F300-\U0001F5FF" # symbols & pictographs
-        "\U0001F680-\U0001F6FF" # transport & map symbols
-        "\U0001F1E0-\U0001F1FF" # flags (iOS)
-        "\U0001F900-\U0001F9FF" # Supplemental Symbols and Pictographs
-        "\U0001FA70-\U0001FAFF" # Symbols and Pictographs Extended-A
-        "\U00002702-\U000027B0" # Dingbats
-        "\U000024C2-\U0001F251"
-        "\U0000FE00-\U0000FE0F" # Variation Selectors
-        "\U000020D0-\U000020FF"
-        "]+", flags=re.UNICODE
-    )
-    text = emoji_pattern.sub(r'', text)
+    if not text.isascii():
+        text = text.translate(_PUNCT_TABLE)
+        text = _EMOJI_RE.sub(r'', text)
 
     # Correct whitespace handling: collapse multiple spaces, collapse multiple newlines
-    text = re.sub(r' +', ' ', text)
-    text = re.sub(r'\n{2,}', '\n', text)
+    text = _MULTI_SPACE_RE.sub(' ', text)
+    text = _MULTI_NL_RE.sub('\n', text)
 
     return text.strip()
 
 def anonymize_text(text: str) -> str:
-    """Anonymizes PII like emails and phone numbers, skipping image tags."""
-    if not isinstance(text, str): return ""
+    """Anonymizes PII like emails and phone numbers, skipping image tags.
 
-    image_tag_pattern = r'(\[image: [^\]]+\])'
-    image_tags = re.findall(image_tag_pattern, text)
-    placeholder = '___IMG_TAG_PLACEHOLDER___'
-    text_with_placeholders = re.sub(image_tag_pattern, placeholder, text)
+    >>> anonymize_text("Call (555)\\xa0123\\xa04567")
+    'Call xxxxxxxxxxxxxx'
+    >>> anonymize_text("555 123\\n4567")
+    'xxxxxxxxxxxx'
+    """
+    if not isinstance(text, str): return ""
 
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,7}\b'
-    anonymized_text = re.sub(email_pattern, lambda m: 'x' * len(m.group()), text_with_placeholders)
+    image_tags = _IMAGE_TAG_RE.findall(text)
+    text_with_placeholders = _IMAGE_TAG_RE.sub(_IMG_PLACEHOLDER, text)
 
-    phone_pattern = r'(\(?\d{3}\)?[\s.-]?)?\d{3}[\s.-]?\d{4}'
-    anonymized_text = re.sub(phone_pattern, lambda m: 'x' * len(m.group()), anonymized_text)
+    anonymized_text = text_with_placeholders
+    if '@' in anonymized_text:
+        anonymized_text = _EMAIL_RE.sub(lambda m: 'x' * len(m.group()), anonymized_text)
+    anonymized_text = _PHONE_RE.sub(lambda m: 'x' * len(m.group()), anonymized_text)
 
     tag_iter = iter(image_tags)
-    final_text = re.sub(placeholder, lambda m: next(tag_iter), anonymized_text)
+    final_text = _IMG_PLACEHOLDER_RE.sub(lambda m: next(tag_iter), anonymized_text)
 
     return final_text
 
@@ -73,7 +132,7 @@ def get_cleaned_text(element: Tag) -> str:
     text_parts = list(element.stripped_strings)
     text = ' '.join(text_parts)
     # Replace remaining multiple spaces just in case
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     return text.strip()
 
 def parse_wprm_recipe_card(recipe_container: Tag) -> str:
@@ -82,59 +141,51 @@ def parse_wprm_recipe_card(recipe_container: Tag) -> str:
         return ""
 
     # (Code for parsing WPRM card - unchanged from previous version)
-    selectors_to_remove_from_card = [
-        '.wprm-template-chic-buttons','.wprm-recipe-buttons','.wprm-recipe-print',
-        '.wprm-recipe-pin','.wprm-recipe-jump','.wprm-recipe-adjustable-servings-container',
-        '.wprm-recipe-shop-instacart','.wprm-icon-shortcode','h3.wprm-recipe-nutrition-header',
-        '.wprm-nutrition-label-container','.wprm-recipe-keyword-container',
-        '.wprm-call-to-action','.wprm-recipe-user-rating','.wprm-entry-info','.wprm-entry-footer',
-    ]
-    for selector in selectors_to_remove_from_card:
-        for element in recipe_container.select(selector):
-            element.decompose()
+    for element in _WPRM_REMOVE_SEL.select(recipe_container):
+        element.decompose()
     parts = []
-    title_tag = recipe_container.select_one('h2.wprm-recipe-name')
+    title_tag = _WPRM_NAME_SEL.select_one(recipe_container)
     if title_tag: parts.append(get_cleaned_text(title_tag).upper())
-    summary_tag = recipe_container.select_one('.wprm-recipe-summary')
+    summary_tag = _WPRM_SUMMARY_SEL.select_one(recipe_container)
     if summary_tag: parts.append(get_cleaned_text(summary_tag))
-    prep_time_tag = recipe_container.select_one('.wprm-recipe-prep-time-container .wprm-recipe-time')
-    cook_time_tag = recipe_container.select_one('.wprm-recipe-cook-time-container .wprm-recipe-time')
+    prep_time_tag = _WPRM_PREP_TIME_SEL.select_one(recipe_container)
+    cook_time_tag = _WPRM_COOK_TIME_SEL.select_one(recipe_container)
     if prep_time_tag or cook_time_tag:
         time_parts = []
         if prep_time_tag: time_parts.append(f"Prep Time: {get_cleaned_text(prep_time_tag)}")
         if cook_time_tag: time_parts.append(f"Cook Time: {get_cleaned_text(cook_time_tag)}")
         parts.append("\n" + ", ".join(time_parts))
-    ingredients_container = recipe_container.select_one('.wprm-recipe-ingredients-container')
+    ingredients_container = _WPRM_INGREDIENTS_SEL.select_one(recipe_container)
     if ingredients_container:
-        ingredients_header = ingredients_container.select_one('h3.wprm-recipe-ingredients-header')
+        ingredients_header = _WPRM_INGREDIENTS_HEADER_SEL.select_one(ingredients_container)
         if ingredients_header: parts.append(f"\n{get_cleaned_text(ingredients_header)}")
-        for group in ingredients_container.select('.wprm-recipe-ingredient-group'):
-            group_header = group.select_one('h4.wprm-recipe-group-name')
+        for group in _WPRM_INGREDIENT_GROUP_SEL.select(ingredients_container):
+            group_header = _WPRM_GROUP_NAME_SEL.select_one(group)
             if group_header: parts.append(f"\n{get_cleaned_text(group_header)}")
-            for li in group.select('li.wprm-recipe-ingredient'):
-                amount = get_cleaned_text(li.select_one('.wprm-recipe-ingredient-amount'))
-                unit = get_cleaned_text(li.select_one('.wprm-recipe-ingredient-unit'))
-                name = get_cleaned_text(li.select_one('.wprm-recipe-ingredient-name'))
-                notes = get_cleaned_text(li.select_one('.wprm-recipe-ingredient-notes'))
+            for li in _WPRM_INGREDIENT_SEL.select(group):
+                amount = get_cleaned_text(_WPRM_AMOUNT_SEL.select_one(li))
+                unit = get_cleaned_text(_WPRM_UNIT_SEL.select_one(li))
+                name = get_cleaned_text(_WPRM_INGREDIENT_NAME_SEL.select_one(li))
+                notes = get_cleaned_text(_WPRM_INGREDIENT_NOTES_SEL.select_one(li))
                 ingredient_line = f"- {amount} {unit} {name}".strip()
                 if notes: ingredient_line += f" ({notes})"
                 parts.append(ingredient_line.replace('▢', '').strip())
-    instructions_container = recipe_container.select_one('.wprm-recipe-instructions-container')
+    instructions_container = _WPRM_INSTRUCTIONS_SEL.select_one(recipe_container)
     if instructions_container:
-        instructions_header = instructions_container.select_one('h3.wprm-recipe-instructions-header')
+        instructions_header = _WPRM_INSTRUCTIONS_HEADER_SEL.select_one(instructions_container)
         if instructions_header: parts.append(f"\n{get_cleaned_text(instructions_header)}")
-        for group in instructions_container.select('.wprm-recipe-instruction-group'):
-            group_header = group.select_one('h4.wprm-recipe-group-name')
+        for group in _WPRM_INSTRUCTION_GROUP_SEL.select(instructions_container):
+            group_header = _WPRM_GROUP_NAME_SEL.select_one(group)
             if group_header: parts.append(f"\n{get_cleaned_text(group_header)}")
-            instruction_list = group.select_one('ul.wprm-recipe-instructions, ol.wprm-recipe-instructions')
+            instruction_list = _WPRM_INSTRUCTION_LIST_SEL.select_one(group)
             if instruction_list:
                 for i, li in enumerate(instruction_list.find_all('li', recursive=False), 1):
                     instruction_text = get_cleaned_text(li)
                     if instruction_text: parts.append(f"{i}. {instruction_text}")
-    notes_container = recipe_container.select_one('.wprm-recipe-notes-container')
+    notes_container = _WPRM_NOTES_SEL.select_one(recipe_container)
     if notes_container:
-        notes_header = notes_container.select_one('h3.wprm-recipe-notes-header')
-        notes_content_element = notes_container.select_one('.wprm-recipe-notes')
+        notes_header = _WPRM_NOTES_HEADER_SEL.select_one(notes_container)
+        notes_content_element = _WPRM_NOTES_CONTENT_SEL.select_one(notes_container)
         if notes_content_element:
              notes_text = get_cleaned_text(notes_content_element)
              if notes_text:
@@ -145,16 +196,16 @@ def parse_wprm_recipe_card(recipe_container: Tag) -> str:
 
 def parse_html_content(html: str, url: str) -> dict | None:
     """Parses the full HTML content using BeautifulSoup."""
-    soup = BeautifulSoup(html, 'html.parser')
+    soup = BeautifulSoup(html, 'lxml')
 
     # 1. Find the main article container
-    article_container = soup.select_one('article.entry')
+    article_container = _ARTICLE_SEL.select_one(soup)
     if not article_container:
         print(f"No 'article.entry' found for {url}")
         return None
 
     # 2. Get the title
-    title_tag = article_container.select_one('h1.entry-title')
+    title_tag = _TITLE_SEL.select_one(article_container)
     if not title_tag:
         print(f"No 'h1.entry-title' found for {url}")
         return None
@@ -162,31 +213,26 @@ def parse_html_content(html: str, url: str) -> dict | None:
 
     # 3. Determine subdomain
     subdomain = "Cooking" # Default
-    category_link = article_container.select_one('p.entry-meta .entry-categories a[href*="/backyard-garden/"]')
+    category_link = _GARDEN_CATEGORY_SEL.select_one(article_container)
     # Use get_cleaned_text for robustness
     if category_link and "Backyard Garden" in get_cleaned_text(category_link):
         subdomain = "Planting"
 
     # 4. Get the main content area
-    content_area = article_container.select_one('.entry-content')
+    content_area = _CONTENT_SEL.select_one(article_container)
     if not content_area:
         print(f"No '.entry-content' found for {url}")
         return None
 
     # 5. --- Decompose common and type-specific junk ---
-    selectors_to_remove = [
-        '.entry-meta', '.share-before', '.share-after', '.google-auto-placed',
-        '.ap_container', 'ins.adsbygoogle', '.jp-relatedposts', '.wprm-recipe-snippet',
-    ]
-    for selector in selectors_to_remove:
-        for element in article_container.select(selector):
-            element.decompose()
+    for element in _REMOVE_SEL.select(article_container):
+        element.decompose()
 
     # 6. --- Handle Recipe Card (if Cooking) ---
     recipe_text = ""
     if subdomain == "Cooking":
         # Look for the recipe container *within the potentially modified content_area*
-        recipe_card_container = content_area.select_one('div[id*="wprm-recipe-container-"]')
+        recipe_card_container = _RECIPE_CARD_SEL.select_one(content_area)
         if recipe_card_container:
             recipe_text = parse_wprm_recipe_card(recipe_card_container)
             recipe_card_container.decompose() # Remove after parsing
@@ -261,7 +307,7 @@ def parse_html_content(html: str, url: str) -> dict | None:
     normalized_title = normalize_text(title)
     cleaned_content = anonymize_text(normalize_text(full_content_text))
 
-    text_for_length_check = re.sub(r'\[image: [^\]]+\]', '', cleaned_content)
+    text_for_length_check = _IMAGE_TAG_RE.sub('', cleaned_content)
     min_length = 100 if recipe_text else 150
     if len(text_for_length_check) < min_length:
         print(f"Skipped {url}: Content too short ({len(text_for_length_check)} chars, needed {min_length}) after cleaning.")
@@ -275,7 +321,7 @@ def parse_html_content(html: str, url: str) -> dict | None:
     }
 
     data = {
-        "ID": hashlib.md5(url.encode('utf-8')).hexdigest(),
+        "ID": hashlib.md5(url.encode('utf-8'), usedforsecurity=False).hexdigest(),
         "Text": f"{normalized_title}\n{cleaned_content}",
         "meta": {
             "data_info": {
@@ -288,37 +334,94 @@ def parse_html_content(html: str, url: str) -> dict | None:
     }
     return data
 
-def scrape_url_task(url: str):
-    """Fetches and parses a single URL using Playwright and BeautifulSoup."""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        try:
-            # Allow images, block others
-            page.route("**/*", lambda route: route.abort() if route.request.resource_type in {"stylesheet", "font", "media"} else route.continue_())
-            page.goto(url, wait_until='domcontentloaded', timeout=60000)
-            # Give page a moment longer to potentially finish rendering images
-            page.wait_for_timeout(1000) # Wait 1 second
-            html = page.content()
-            return parse_html_content(html, url)
-        except Exception as e:
-            print(f"Playwright/Navigation Error for {url}: {e}")
-            return None
-        finally:
-            page.close()
-            browser.close()
+BLOCKED_RESOURCE_TYPES = frozenset({"stylesheet", "font", "media", "image", "other"})
+BLOCKED_HOSTS = (
+    "doubleclick.net", "googlesyndication.com", "googletagmanager.com",
+    "google-analytics.com", "googleadservices.com", "facebook.net", "facebook.com",
+    "amazon-adsystem.com", "adthrive.com", "mediavine.com", "taboola.com", "outbrain.com",
+    "pinterest.com", "hotjar.com",
+)
+_BLOCKED_HOST_SUFFIXES = tuple("." + host for host in BLOCKED_HOSTS)
+
+async def block_unneeded_requests(route):
+    """Lets only the document through; heavy resources and ad/analytics hosts are aborted."""
+    request = route.request
+    if request.resource_type in BLOCKED_RESOURCE_TYPES:
+        return await route.abort()
+    host = urlparse(request.url).hostname or ""
+    if ("." + host).endswith(_BLOCKED_HOST_SUFFIXES):
+        return await route.abort()
+    return await route.continue_()
+
+async def scrape_url_task(browser, sem: asyncio.Semaphore, parse_pool: ThreadPoolExecutor, url: str):
+    """Fetches a single URL in its own context on the shared browser, then parses it off the event loop."""
+    try:
+        async with sem:
+            ctx = await browser.new_context()
+            try:
+                page = await ctx.new_page()
+                await page.route("**/*", block_unneeded_requests)
+                await page.goto(url, wait_until='domcontentloaded', timeout=60000)
+                html = await page.content()
+            finally:
+                await ctx.close()
+    except Exception as e:
+        print(f"Playwright/Navigation Error for {url}: {e}")
+        return None
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(parse_pool, parse_html_content, html, url)
+
+async def run_all(urls_to_scrape: list, f_out, counts: dict):
+    """Drives every URL through one browser and writes results as they complete."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        sem = asyncio.Semaphore(MAX_PARALLEL_PAGES)
+        with ThreadPoolExecutor(max_workers=PARSE_WORKERS) as parse_pool:
+            async def run_one(url):
+                try:
+                    return url, await scrape_url_task(browser, sem, parse_pool, url), None
+                except Exception as exc:
+                    return url, None, exc
+
+            write_buf = []
+            try:
+                for next_done in asyncio.as_completed([run_one(url) for url in urls_to_scrape]):
+                    url, article_data, exc = await next_done
+                    if exc is not None:
+                        print(f"❌ UNEXPECTED ERROR during processing for {url}: {exc}")
+                        counts['error'] += 1
+                    elif article_data:
+                        try:
+                           json_line = orjson.dumps(article_data) + b'\n'
+                        except orjson.JSONEncodeError as json_err:
+                            print(f"❌ JSON SERIALIZATION ERROR for {url}: {json_err}. Data: {article_data}")
+                            counts['error'] += 1
+                            continue
+                        write_buf.append(json_line)
+                        if len(write_buf) >= WRITE_BATCH_SIZE:
+                            f_out.write(b''.join(write_buf))
+                            write_buf.clear()
+                            f_out.flush()
+                        counts['scraped'] += 1
+                        print(f"✅ SUCCESS: Scraped {url}")
+                    else:
+                         print(f"⏭️ SKIPPED/NO DATA: {url}")
+                         counts['skipped'] += 1
+            finally:
+                f_out.write(b''.join(write_buf))
+        await browser.close()
 
 def main():
     """Main function to read URLs, manage scraping processes, and write output."""
     scraped_urls = set()
     try:
-        with open(OUTPUT_FILE, 'r', encoding='utf-8') as f_out:
+        with open(OUTPUT_FILE, 'rb') as f_out:
             for line in f_out:
                 try:
-                    data = json.loads(line)
+                    data = orjson.loads(line)
                     scraped_urls.add(data['meta']['data_info']['url'])
-                except (json.JSONDecodeError, KeyError, TypeError):
-                    print(f"Skipping malformed line in output file: {line.strip()}")
+                except (orjson.JSONDecodeError, KeyError, TypeError):
+                    print(f"Skipping malformed line in output file: {line.strip().decode('utf-8', 'replace')}")
                     continue
         print(f"Found {len(scraped_urls)} already scraped URLs. Resuming...")
     except FileNotFoundError:
@@ -338,40 +441,17 @@ def main():
 
     print(f"Total unique URLs in input file: {len(all_urls)}. Already scraped: {len(scraped_urls)}. Remaining to scrape: {len(urls_to_scrape)}.")
     start_time = time.time()
-    scraped_count = 0
-    skipped_count = 0
-    error_count = 0
-
-    with open(OUTPUT_FILE, 'a', encoding='utf-8') as f_out:
-        with ProcessPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_url = {executor.submit(scrape_url_task, url): url for url in urls_to_scrape}
+    counts = {'scraped': 0, 'skipped': 0, 'error': 0}
 
-            for future in as_completed(future_to_url):
-                url = future_to_url[future]
-                try:
-                    article_data = future.result()
-                    if article_data:
-                        try:
-                           json_string = json.dumps(article_data, ensure_ascii=False)
-                           f_out.write(json_string + '\n')
-                           scraped_count += 1
-                           print(f"✅ SUCCESS: Scraped {url}")
-                        except TypeError as json_err:
-                            print(f"❌ JSON SERIALIZATION ERROR for {url}: {json_err}. Data: {article_data}")
-                            error_count += 1
-                    else:
-                         print(f"⏭️ SKIPPED/NO DATA: {url}")
-                         skipped_count +=1
-                except Exception as exc:
-                    print(f"❌ UNEXPECTED ERROR during processing for {url}: {exc}")
-                    error_count += 1
+    with open(OUTPUT_FILE, 'ab') as f_out:
+        asyncio.run(run_all(urls_to_scrape, f_out, counts))
 
     end_time = time.time()
     total_time = end_time - start_time
     print("\n--- Scraping Complete ---")
-    print(f"Successfully scraped and saved: {scraped_count}")
-    print(f"Skipped (no data/too short): {skipped_count}")
-    print(f"Errors during processing: {error_count}")
+    print(f"Successfully scraped and saved: {counts['scraped']}")
+    print(f"Skipped (no data/too short): {counts['skipped']}")
+    print(f"Errors during processing: {counts['error']}")
     print(f"Total URLs attempted this run: {len(urls_to_scrape)}")
     print(f"Total time taken: {total_time:.2f} seconds.")
 
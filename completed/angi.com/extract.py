@@ -1,6 +1,10 @@
-from bs4 import BeautifulSoup
+import lxml.html
+from lxml.cssselect import CSSSelector
+import html
+import mmap
 import os
-from urllib.parse import urljoin
+import re
+from urllib.parse import urljoin, urlparse
 
 # --- Configuration ---
 # Set the base URL of the website.
@@ -11,6 +15,17 @@ INPUT_HTML_FILE = "main1.html"
 OUTPUT_TXT_FILE = "links1.txt"
 # --- End of Configuration ---
 
+# Compiled once to XPath at import instead of re-parsing the selector on every call
+ARTICLE_SEL = CSSSelector(
+    "a.ContentCard_title-content-size-small__6HRGQ.ContentCard_anchor__w9Of8"
+)
+
+# Fast path: pull hrefs straight out of the raw bytes for <a> tags carrying both classes
+ARTICLE_HREF_RE = re.compile(
+    rb'<a[^>]*\bclass="[^"]*ContentCard_title-content-size-small__6HRGQ[^"]*'
+    rb'ContentCard_anchor__w9Of8[^"]*"[^>]*\bhref="([^"]+)"'
+)
+
 
 def scrape_full_links(input_file, output_file, base_url):
     """
@@ -26,29 +41,40 @@ def scrape_full_links(input_file, output_file, base_url):
         print(f"Error: The file '{input_file}' was not found.")
         return
 
+    hrefs = []
+    # mmap can't map an empty file, and an empty file has no links anyway
+    if os.path.getsize(input_file):
+        # Map the file instead of reading it, so the regex scans the page cache directly
+        with open(input_file, "rb") as f_in, \
+                mmap.mmap(f_in.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Raw attribute values may still carry entities like &amp;, which the parser would decode
+            hrefs = [html.unescape(h.decode("utf-8")) for h in ARTICLE_HREF_RE.findall(mm)]
+
+            if not hrefs:
+                # Attribute order or quoting didn't suit the regex; fall back to a real parse
+                tree = lxml.html.fromstring(mm[:])
+                hrefs = [link.get("href") for link in ARTICLE_SEL(tree) if link.get("href")]
+
+    if not hrefs:
+        print("No article links found with the specified selector.")
+        return
+
+    print(f"Found {len(hrefs)} links. Writing full URLs to '{output_file}'...")
+
+    # Combine the base URL with each relative path to create full links, only
+    # falling back to urljoin's full parse for hrefs that aren't absolute or root-relative
+    base_origin = "https://" + urlparse(base_url).netloc
+    full_urls = []
+    for h in hrefs:
+        if h.startswith(("http://", "https://")):
+            full_urls.append(h)
+        elif h.startswith("/") and not h.startswith("//"):
+            full_urls.append(base_origin + h)
+        else:
+            full_urls.append(urljoin(base_url, h))
+
     with open(output_file, "w") as f_out:
-        with open(input_file, "r", encoding="utf-8") as f_in:
-            soup = BeautifulSoup(f_in, "html.parser")
-
-            article_links = soup.select(
-                "a.ContentCard_title-content-size-small__6HRGQ.ContentCard_anchor__w9Of8"
-            )
-
-            if not article_links:
-                print("No article links found with the specified selector.")
-                return
-
-            print(
-                f"Found {len(article_links)} links. Writing full URLs to '{output_file}'..."
-            )
-
-            for link in article_links:
-                relative_path = link.get("href")
-                if relative_path:
-                    # Combine the base URL with the relative path to create a full link.
-                    full_url = urljoin(base_url, relative_path)
-                    # Write the full URL to the output file.
-                    f_out.write(full_url + "\n")
+        f_out.writelines(u + "\n" for u in full_urls)
 
     print("Scraping complete. All full links have been saved.")
 
@@ -1,19 +1,27 @@
 # scraper_bakingbar.py
 
-import requests
-from bs4 import BeautifulSoup
-import time
+import asyncio
+import aiohttp
+from selectolax.lexbor import LexborHTMLParser
+from pybloom_live import ScalableBloomFilter
 
-def scrape_category(category_url, file_handler, tracked_links_set):
+MAX_CATEGORY_WORKERS = 4  # Categories paginating at the same time
+
+async def scrape_category(session, category_url, file_handler, tracked_links_set):
     """
     Scrapes all article links from a given category, handling pagination.
 
     Args:
+        session (aiohttp.ClientSession): The shared HTTP session.
         category_url (str): The URL of the category to scrape.
         file_handler: The file object opened for writing.
-        tracked_links_set (set): A set to prevent duplicate link writes.
+        tracked_links_set (ScalableBloomFilter): Links already written, to prevent duplicate writes.
+
+    Returns:
+        int: The number of links written for this category.
     """
     page_number = 1
+    written_count = 0
     
     while True:
         if page_number == 1:
@@ -26,39 +34,49 @@ def scrape_category(category_url, file_handler, tracked_links_set):
         print(f"Scraping page {page_number} of '{category_url}'...")
         
         try:
-            response = requests.get(current_url, headers={'User-Agent': 'Mozilla/5.0'}, timeout=15)
-            
-            # A 404 error means we've reached the last page
-            if response.status_code == 404:
-                print(f"  -> Page {page_number} not found. Finished this category.\n")
-                break
-            
-            response.raise_for_status()
+            async with session.get(current_url) as response:
+                # Dispatch on the status code so 4xx/5xx pages end the category without
+                # raising and catching an exception
+                status = response.status
+                # A 404 error means we've reached the last page
+                if status == 404:
+                    print(f"  -> Page {page_number} not found. Finished this category.\n")
+                    break
+                if status >= 400:
+                    print(f"  -> HTTP {status} on {current_url}, stopping.\n")
+                    break
+
+                content = await response.read()
 
-        except requests.exceptions.RequestException as e:
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
             print(f"  -> An error occurred while fetching {current_url}: {e}\n")
             break
 
-        soup = BeautifulSoup(response.content, 'html.parser')
+        tree = LexborHTMLParser(content)
         
         # Find all h2 tags with the specific class for article titles
-        article_headings = soup.find_all('h2', class_='cm-entry-title')
+        article_headings = tree.css('h2.cm-entry-title')
         
         # If no headings are found on a page (after the first one), we assume we're done.
         if not article_headings and page_number > 1:
             print("  -> No more articles found. Finished this category.\n")
             break
 
-        new_links_on_page = 0
+        page_links = []
         for heading in article_headings:
-            link_tag = heading.find('a')
-            if link_tag and 'href' in link_tag.attrs:
-                link = link_tag['href']
-                # Write the link only if it's new for this session
-                if link not in tracked_links_set:
-                    file_handler.write(link + '\n')
-                    tracked_links_set.add(link)
-                    new_links_on_page += 1
+            link_tag = heading.css_first('a')
+            link = link_tag.attributes.get('href') if link_tag is not None else None
+            if link is not None:
+                page_links.append(link)
+
+        # Write only links that are new for this session, in page order, in one call.
+        # No await happens in between, so categories running concurrently can't interleave here
+        new_links = [link for link in dict.fromkeys(page_links) if link not in tracked_links_set]
+        file_handler.writelines(link + '\n' for link in new_links)
+        for link in new_links:
+            tracked_links_set.add(link)
+        new_links_on_page = len(new_links)
+        written_count += new_links_on_page
         
         if new_links_on_page > 0:
             print(f"  -> Found and wrote {new_links_on_page} new link(s).")
@@ -66,9 +84,11 @@ def scrape_category(category_url, file_handler, tracked_links_set):
             print("  -> No new links were found on this page.")
 
         page_number += 1
-        time.sleep(1) # Wait a second between requests to be polite
+        await asyncio.sleep(1) # Wait a second between requests to be polite, without blocking other categories
+
+    return written_count
 
-def main():
+async def main():
     """
     Main function to run the scraper.
     """
@@ -86,22 +106,39 @@ def main():
     ]
     
     output_filename = "bakingbar_links.txt"
-    tracked_links = set()
+    # A Bloom filter costs a couple of bytes per link instead of a full str in a set;
+    # a rare false positive only skips a link. len() on it is an estimate, so count writes separately
+    tracked_links = ScalableBloomFilter(initial_capacity=10000, error_rate=0.001)
     
     try:
         # Open the file once with a writing stream
         with open(output_filename, 'w', encoding='utf-8') as file:
             print(f"Opened '{output_filename}' for writing. Starting scrape...\n")
             
-            # Scrape each category URL from the list
-            for url in category_urls_to_scrape:
-                scrape_category(url, file, tracked_links)
+            # One shared session for every category; limit_per_host keeps the overlap polite.
+            # Idle connections and DNS answers outlive the 1s pauses, so every page after the
+            # first reuses a warm keep-alive connection instead of a fresh TCP+TLS handshake
+            connector = aiohttp.TCPConnector(limit_per_host=4, keepalive_timeout=30, ttl_dns_cache=300)
+            timeout = aiohttp.ClientTimeout(total=15)
+            async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                             headers={'User-Agent': 'Mozilla/5.0'}) as session:
+                # Scrape up to MAX_CATEGORY_WORKERS categories concurrently; each still pages
+                # through in order and sleeps between its own pages
+                category_slots = asyncio.Semaphore(MAX_CATEGORY_WORKERS)
+
+                async def scrape_bounded(url):
+                    async with category_slots:
+                        return await scrape_category(session, url, file, tracked_links)
+
+                written_counts = await asyncio.gather(*[
+                    scrape_bounded(url) for url in category_urls_to_scrape
+                ])
                 
         print(f"\nScraping complete.")
-        print(f"Found and saved a total of {len(tracked_links)} unique links to '{output_filename}'.")
+        print(f"Found and saved a total of {sum(written_counts)} unique links to '{output_filename}'.")
         
     except IOError as e:
         print(f"Fatal Error: Could not write to file '{output_filename}': {e}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file